@@ -2,14 +2,19 @@ from flask import Flask, request
 from flask_cors import CORS
 from flask_socketio import SocketIO
 import os
+from app.utils.responses import OrjsonModule, OrjsonProvider
 
 socketio = SocketIO()
 
 def create_app():
     """Create and configure the Flask application"""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
     app.config['DYNAMODB_TABLE'] = os.environ.get('DYNAMODB_TABLE', 'chat_app_jrw')
+    # Attachment uploads are capped here; larger request bodies are rejected with 413
+    # while werkzeug reads them, since browsers rarely send per-part Content-Length
+    app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_BYTES', 25 * 1024 * 1024))
     
     # Initialize CORS
     CORS(app, resources={
@@ -20,8 +25,17 @@ def create_app():
         }
     })
     
+    # Compress JSON bodies (channel/message lists shrink 5-10x); tiny payloads aren't worth it
+    app.config['COMPRESS_MIMETYPES'] = ['application/json']
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_LEVEL'] = 4
+    app.config['COMPRESS_BR_LEVEL'] = 4
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    from flask_compress import Compress
+    Compress(app)
+    
     # Initialize SocketIO
-    socketio.init_app(app, cors_allowed_origins="*")
+    socketio.init_app(app, cors_allowed_origins="*", json=OrjsonModule)
     
     # Register blueprints
     from app.routes import channels, health, auth, messages, users, uploads, search, vector, qa, user_profile
@@ -1,12 +1,12 @@
-from typing import Optional, List, Dict, Set
+from typing import Optional, List, Dict, Set, Tuple
 from datetime import datetime, timezone
 import uuid
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
 from ..models.user import User
 from ..models.channel import Channel
 from ..models.message import Message
 from ..models.reaction import Reaction
+from ..services.base_service import get_dynamodb
 from ..services.user_service import UserService
 from ..services.channel_service import ChannelService
 from ..services.message_service import MessageService
@@ -15,8 +15,15 @@ from ..services.workspace_service import WorkspaceService
 from ..models.workspace import Workspace
 import os
 import asyncio
+import logging
+from functools import lru_cache
 from app.services.user_profile_service import UserProfileService
 
+logger = logging.getLogger(__name__)
+
+# Read once at import; every facade and route module uses the same table
+TABLE_NAME = os.environ.get('DYNAMODB_TABLE', 'chat_app_jrw')
+
 class DynamoDB:
     def __init__(self, table_name: str = None):
         """Initialize DynamoDB connection and create table if needed
@@ -65,19 +72,14 @@ class DynamoDB:
         - Search messages: Query GSI3 (CONTENT#{word})
         - Get user by username: Query GSI4 (NAME#{name})
         """
-        self.table_name = table_name or os.getenv('DYNAMODB_TABLE', 'chat_app_jrw')
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION')
-        )
+        self.table_name = table_name or TABLE_NAME
+        self.dynamodb = get_dynamodb()
         self.table = self.dynamodb.Table(self.table_name)
         self.user_service = UserService(table_name)
-        self.channel_service = ChannelService(table_name)
-        self.message_service = MessageService(table_name)
-        self.search_service = SearchService(table_name)
         self.workspace_service = WorkspaceService(table_name)
+        self.channel_service = ChannelService(table_name, user_service=self.user_service, workspace_service=self.workspace_service)
+        self.message_service = MessageService(table_name, index_write_behind=True)
+        self.search_service = SearchService(table_name)
         
         # Ensure general channel exists
         try:
@@ -105,12 +107,12 @@ class DynamoDB:
                         'members': []
                     }
                 )
-                print("Created general channel")
+                logger.info("Created general channel")
         except Exception as e:
-            print(f"Error checking/creating general channel: {e}")
+            logger.exception("Error checking/creating general channel")
         
     def _generate_id(self) -> str:
-        return str(uuid.uuid4())
+        return uuid.uuid4().hex
         
     def _now(self) -> str:
         return datetime.now(timezone.utc).isoformat()
@@ -130,18 +132,27 @@ class DynamoDB:
     def get_all_users(self) -> List[Dict]:
         return self.user_service.get_all_users()
 
+    def search_users(self, query: str) -> List[User]:
+        return self.user_service.search_users(query)
+
     def get_persona_users(self) -> List[User]:
         return self.user_service.get_persona_users()
 
     def _batch_get_users(self, user_ids: Set[str]) -> List[User]:
         return self.user_service._batch_get_users(user_ids)
     
+    def get_channels_by_ids(self, channel_ids) -> Dict[str, Channel]:
+        return self.channel_service.get_channels_by_ids(channel_ids)
+
     def create_channel(self, name: str, type: str = 'public', created_by: str = None, other_user_id: str = None, workspace_id: str = None) -> Channel:
         return self.channel_service.create_channel(name, type, created_by, other_user_id, workspace_id)
 
     def add_channel_member(self, channel_id: str, user_id: str) -> None:
         return self.channel_service.add_channel_member(channel_id, user_id)
 
+    def remove_channel_member(self, channel_id: str, user_id: str) -> None:
+        return self.channel_service.remove_channel_member(channel_id, user_id)
+
     def mark_channel_read(self, channel_id: str, user_id: str) -> None:
         """Mark a channel as read for a user."""
         return self.channel_service.mark_channel_read(channel_id, user_id)
@@ -158,9 +169,15 @@ class DynamoDB:
     def get_channel_by_id(self, channel_id: str) -> Optional[Channel]:
         return self.channel_service.get_channel_by_id(channel_id)
 
+    def get_channel_with_members(self, channel_id: str, member_types: Optional[set] = None) -> Optional[Channel]:
+        return self.channel_service.get_channel_with_members(channel_id, member_types)
+
     def get_channel_message_count(self, channel_id: str) -> int:
         return self.channel_service.get_channel_message_count(channel_id)
 
+    def count_messages(self, channel_id: str, limit: Optional[int] = None) -> int:
+        return self.channel_service.count_messages(channel_id, limit)
+
     def get_other_dm_user(self, channel_id: str, user_id: str) -> Optional[str]:
         """Get the other user's ID in a DM channel"""
         return self.channel_service.get_other_dm_user(channel_id, user_id)
@@ -178,8 +195,16 @@ class DynamoDB:
         """Get a message by ID. If thread_id is provided, the message is retrieved as a reply in that thread."""
         return self.message_service.get_message(message_id, thread_id)
 
-    def get_messages(self, channel_id: str, limit: int = 50, start_time: Optional[str] = None, end_time: Optional[str] = None) -> List[Message]:
-        return self.message_service.get_messages(channel_id, limit, start_time=start_time, end_time=end_time)
+    def get_messages(self, channel_id: str, limit: int = 50, start_time: Optional[str] = None, end_time: Optional[str] = None, before: Optional[str] = None) -> List[Message]:
+        return self.message_service.get_messages(channel_id, limit, start_time=start_time, end_time=end_time, before=before)
+
+    def get_messages_raw(self, channel_id: str, limit: int = 50, start_time: Optional[str] = None, end_time: Optional[str] = None, before: Optional[str] = None) -> List[Dict]:
+        """Get channel messages as API-shaped dicts, without building Message objects."""
+        return self.message_service.get_messages_raw(channel_id, limit, start_time=start_time, end_time=end_time, before=before)
+
+    def get_messages_page(self, channel_id: str, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one cursor-paginated page of channel messages as API-shaped dicts."""
+        return self.message_service.get_messages_page(channel_id, limit, cursor=cursor)
 
     def get_user_messages(self, user_id: str, before: str = None, limit: int = 50) -> List[Message]:
         """Get messages created by a user."""
@@ -191,8 +216,8 @@ class DynamoDB:
     def get_thread_messages(self, thread_id: str) -> List[Message]:
         return self.message_service.get_thread_messages(thread_id)
 
-    def get_message_reactions(self, message_id: str) -> List[Reaction]:
-        return self.message_service.get_message_reactions(message_id)
+    def get_message_reactions(self, message_id: str, thread_id: Optional[str] = None) -> Dict[str, List[str]]:
+        return self.message_service.get_message_reactions(message_id, thread_id)
 
     def remove_reaction(self, message_id: str, user_id: str, emoji: str, thread_id: Optional[str] = None) -> None:
         return self.message_service.remove_reaction(message_id, user_id, emoji, thread_id)
@@ -276,6 +301,11 @@ class DynamoDB:
 #
 # This setup allows for efficient querying by both workspace ID and name, supporting operations like creation, retrieval, and listing of workspaces.
 
+@lru_cache(maxsize=1)
+def get_db() -> DynamoDB:
+    """Process-wide DynamoDB facade, so route modules share one set of services and pools."""
+    return DynamoDB(table_name=TABLE_NAME)
+
 user_profile_service = UserProfileService()
 
 def create_user_profile(user_id: str, profile_data: dict):
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional, Dict
 
-@dataclass
+@dataclass(slots=True)
 class Channel:
     id: str
     name: str
@@ -14,6 +14,7 @@ class Channel:
     last_read: Optional[str] = None  # Last read timestamp for current user
     unread_count: int = 0  # Unread count for current user
     is_member: bool = False  # Indicates if the current user is a member of the channel
+    message_count: int = 0  # Maintained on the channel item by MessageService.create_message
 
     def to_dict(self, current_user_id=None):
         """Format channel data for output"""
@@ -1,8 +1,26 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Sequence
+from .user import User
 
-@dataclass
+
+def _fmt_dt(value):
+    """Format datetime values for output, passing stored strings through.
+
+    Uses an exact type check; model timestamps are never datetime subclasses.
+    """
+    if type(value) is datetime:
+        # Same output as strftime('%Y-%m-%d %H:%M:%S') without parsing a format string
+        return f'{value.year:04d}-{value.month:02d}-{value.day:02d} {value.hour:02d}:{value.minute:02d}:{value.second:02d}'
+    return value
+
+
+# Shared immutable default for list fields; most messages have no attachments,
+# edits or replies, so they all point at this one tuple instead of allocating.
+EMPTY_LIST = ()
+
+
+@dataclass(slots=True, eq=False)
 class Message:
     id: str
     content: str
@@ -13,31 +31,67 @@ class Message:
     edited_at: Optional[str] = None
     is_edited: bool = False
     version: int = 1
-    reactions: Dict[str, List[str]] = field(default_factory=dict)
-    attachments: List[str] = field(default_factory=list)
+    reactions: Dict[str, List[str]] = field(default_factory=dict)  # stored items always carry a map
+    attachments: Sequence[str] = EMPTY_LIST
     reply_count: Optional[int] = 0
-    user: Optional[dict] = None
-    edit_history: List[Dict] = field(default_factory=list)
-    replies: List[str] = field(default_factory=list)
+    user: Optional[User | dict] = None
+    edit_history: Sequence[Dict] = EMPTY_LIST
+    replies: Sequence[str] = EMPTY_LIST
+    channel_message_number: Optional[int] = None  # Set by create_message when the channel keeps a counter
+
+    def add_reply(self, reply_id: str) -> None:
+        """Record a reply, giving this message its own list on the first one."""
+        if self.replies is EMPTY_LIST:
+            self.replies = []
+        self.replies.append(reply_id)
+        self.reply_count = len(self.replies)
+
+    @classmethod
+    def _init_from_row(cls, row: Dict, user=None) -> 'Message':
+        """Build a Message straight from a DynamoDB item.
+        
+        Item attributes share the dataclass field names. user is not stored
+        on the item and is passed separately.
+        """
+        return cls(
+            id=row['id'],
+            content=row['content'],
+            user_id=row['user_id'],
+            channel_id=row['channel_id'],
+            created_at=row['created_at'],
+            thread_id=row.get('thread_id'),
+            edited_at=row.get('edited_at'),
+            is_edited=row.get('is_edited', False),
+            version=row.get('version', 1),
+            reactions=row.get('reactions', {}),
+            attachments=row.get('attachments', EMPTY_LIST),
+            reply_count=row.get('reply_count', 0),
+            user=user,
+            edit_history=row.get('edit_history', EMPTY_LIST),
+            replies=row.get('replies', EMPTY_LIST),
+            channel_message_number=row.get('channel_message_number')
+        )
 
     def to_dict(self):
-        return {
+        """Format message data for output"""
+        user = self.user
+        data = {
             'id': self.id,
             'content': self.content,
             'userId': self.user_id,
             'channelId': self.channel_id,
             'threadId': self.thread_id,
-            'createdAt': (self.created_at.strftime('%Y-%m-%d %H:%M:%S') 
-                         if isinstance(self.created_at, datetime) 
-                         else self.created_at),
+            'createdAt': _fmt_dt(self.created_at),
             'attachments': self.attachments,
-            'user': self.user.to_dict() if hasattr(self.user, 'to_dict') else self.user,
+            'user': user.to_dict() if type(user) is User else user,
             'reactions': self.reactions,
-            'editedAt': (self.edited_at.strftime('%Y-%m-%d %H:%M:%S')
-                        if isinstance(self.edited_at, datetime)
-                        else self.edited_at),
-            'isEdited': self.is_edited,
-            'editHistory': self.edit_history,
-            'replies': self.replies,
-            'replyCount': len(self.replies)
-        } 
\ No newline at end of file
+            'editedAt': _fmt_dt(self.edited_at),
+            'isEdited': self.is_edited
+        }
+        # The frontend treats a missing replies/replyCount the same as an empty thread
+        if self.edit_history:
+            data['editHistory'] = self.edit_history
+        if self.replies:
+            data['replies'] = self.replies
+            data['replyCount'] = len(self.replies)
+        return data
@@ -1,19 +1,23 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 from datetime import datetime
+from .message import _fmt_dt
 
-@dataclass
+@dataclass(slots=True, eq=False, frozen=True)
 class Reaction:
     message_id: str
     user_id: str
     emoji: str
     created_at: str | datetime
+    _dict: Optional[dict] = field(default=None, init=False, repr=False)
 
     def to_dict(self):
-        return {
-            'messageId': self.message_id,
-            'userId': self.user_id,
-            'emoji': self.emoji,
-            'createdAt': (self.created_at.strftime('%Y-%m-%d %H:%M:%S') 
-                         if isinstance(self.created_at, datetime) 
-                         else self.created_at)
-        } 
\ No newline at end of file
+        # Reactions are immutable, so the dict is built once and shared; don't mutate it
+        if self._dict is None:
+            object.__setattr__(self, '_dict', {
+                'messageId': self.message_id,
+                'userId': self.user_id,
+                'emoji': self.emoji,
+                'createdAt': _fmt_dt(self.created_at)
+            })
+        return self._dict 
\ No newline at end of file
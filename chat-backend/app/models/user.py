@@ -1,8 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class User:
     id: str
     email: str
@@ -15,29 +15,42 @@ class User:
     role: Optional[str] = None  # Role for persona users
     bio: Optional[str] = None   # Bio for persona users
     entity_type: str = 'USER'
+    # isoformat() of the timestamps above, computed once for to_dict
+    _last_active_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _created_at_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
-    def to_dict(self):
-        # Convert string timestamps to datetime objects if needed
-        if isinstance(self.last_active, str):
+    def __post_init__(self):
+        # Parse stored string timestamps once at construction instead of on every to_dict.
+        # Exact type checks: timestamps are plain str/datetime, never subclasses.
+        if type(self.last_active) is str:
             try:
-                self.last_active = datetime.fromisoformat(self.last_active.replace(' ', 'T'))
-            except (ValueError, AttributeError):
+                self.last_active = datetime.fromisoformat(self.last_active)
+            except ValueError:
                 self.last_active = None
 
-        if isinstance(self.created_at, str):
+        if type(self.created_at) is str:
             try:
-                self.created_at = datetime.fromisoformat(self.created_at.replace(' ', 'T'))
-            except (ValueError, AttributeError):
+                self.created_at = datetime.fromisoformat(self.created_at)
+            except ValueError:
                 self.created_at = datetime.now()
 
+        self._last_active_iso = self.last_active.isoformat() if self.last_active else None
+        self._created_at_iso = self.created_at.isoformat() if self.created_at else None
+
+    def set_last_active(self, last_active: Optional[datetime]) -> None:
+        """Update last_active, keeping the cached isoformat string in sync."""
+        self.last_active = last_active
+        self._last_active_iso = last_active.isoformat() if last_active else None
+
+    def to_dict(self):
         return {
             'id': self.id,
             'name': self.name,
             'email': self.email,
             'type': self.type,
             'status': self.status,
-            'lastActive': self.last_active.isoformat() if self.last_active else None,
-            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'lastActive': self._last_active_iso,
+            'createdAt': self._created_at_iso,
             'role': self.role,
             'bio': self.bio,
             'entity_type': self.entity_type
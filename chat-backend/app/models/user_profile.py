@@ -1,19 +1,23 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UserProfile:
     user_id: str
     profile_id: str
     entity_type: str = 'USER_PROFILE'
     text: Optional[str] = None
     last_message_timestamp_epoch: Optional[int] = None
+    _dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> dict:
-        return {
-            'user_id': self.user_id,
-            'profile_id': self.profile_id,
-            'entity_type': self.entity_type,
-            'text': self.text,
-            'last_message_timestamp_epoch': self.last_message_timestamp_epoch
-        } 
\ No newline at end of file
+        # Profiles are immutable, so the dict is built once and shared; don't mutate it
+        if self._dict is None:
+            object.__setattr__(self, '_dict', {
+                'user_id': self.user_id,
+                'profile_id': self.profile_id,
+                'entity_type': self.entity_type,
+                'text': self.text,
+                'last_message_timestamp_epoch': self.last_message_timestamp_epoch
+            })
+        return self._dict 
\ No newline at end of file
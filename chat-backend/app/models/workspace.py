@@ -2,6 +2,8 @@ from typing import List
 from datetime import datetime
 
 class Workspace:
+    __slots__ = ('id', 'name', 'created_at', 'channels', 'entity_type')
+
     def __init__(self, id: str, name: str, created_at: datetime, channels: List[str] = None, entity_type: str = 'WORKSPACE'):
         self.id = id
         self.name = name
@@ -1,14 +1,20 @@
 from flask import Blueprint, request, jsonify, current_app
 from app.auth.auth_service import AuthService, auth_required
-from app.db.ddb import DynamoDB
+from app.db.ddb import get_db
+from app.utils.responses import ojsonify
 import os
 import logging
 
 bp = Blueprint('auth', __name__)
-db = DynamoDB(table_name=os.environ.get('DYNAMODB_TABLE', 'chat_app_jrw'))
+logger = logging.getLogger(__name__)
 
 def get_auth_service():
-    return AuthService(db=db, secret_key=current_app.config['SECRET_KEY'])
+    """Return the app's AuthService, constructing it on first use."""
+    auth_service = current_app.extensions.get('auth_service')
+    if auth_service is None:
+        auth_service = AuthService(db=get_db(), secret_key=current_app.config['SECRET_KEY'])
+        current_app.extensions['auth_service'] = auth_service
+    return auth_service
 
 @bp.route('/register', methods=['POST'])
 def register():
@@ -27,45 +33,45 @@ def register():
             name=data['name']
         )
         
-        print(f"Registration successful: {result}")  # Debug log
+        logger.debug("Registration successful for %s", data['email'])
         return jsonify(result), 201
         
     except ValueError as e:
-        print(f"Registration failed: {str(e)}")  # Debug log
+        logger.info("Registration failed: %s", e)
         return jsonify({'error': str(e)}), 400
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")  # Debug log
+        logger.exception("Unexpected error during registration")
         return jsonify({'error': 'Registration failed'}), 500
 
 @bp.route('/login', methods=['POST'])
 def login():
     try:
         data = request.get_json()
-        logging.info(f"Login request received for email: {data.get('email')}")
+        logger.info("Login request received for email: %s", data.get('email'))
         auth_service = get_auth_service()
         result = auth_service.login(
             email=data['email'],
             password=data['password']
         )
-        logging.info(f"Login successful, response: {result}")
-        logging.debug(f"Detailed response: {result}")
+        # The response carries the token, so only the email is logged
+        logger.info("Login successful for email: %s", data['email'])
         return jsonify(result)
     except ValueError as e:
-        logging.error(f"Login failed: {str(e)}")
+        logger.info("Login failed: %s", e)
         return jsonify({'error': str(e)}), 401
     except Exception as e:
-        logging.error(f"Unexpected error during login: {str(e)}")
+        logger.exception("Unexpected error during login")
         return jsonify({'error': 'Login failed'}), 500
     
 @bp.route('/login/persona', methods=['POST'])
 def login_persona():
     # No need for password, need to get a token still
     data = request.get_json()
-    persona_user = db.get_user_by_email(data['email'])
+    persona_user = get_db().get_user_by_email(data['email'])
     auth_service = get_auth_service()
     
     # Set persona user status to online
-    db.update_user_status(persona_user.id, 'online')
+    get_db().update_user_status(persona_user.id, 'online')
     
     token = auth_service.create_token(persona_user.id)
     return jsonify({'token': token, 'user': persona_user.to_dict()})
@@ -74,7 +80,7 @@ def login_persona():
 @auth_required
 def get_current_user():
     user_id = request.user_id
-    user = db.get_user_by_id(user_id)
+    user = get_db().get_user_by_id(user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
     return jsonify(user.to_dict())
@@ -82,7 +88,7 @@ def get_current_user():
 @bp.route('/users/<user_id>')
 @auth_required
 def get_user(user_id):
-    user = db.get_user_by_id(user_id)
+    user = get_db().get_user_by_id(user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
     return jsonify(user.to_dict())
@@ -93,11 +99,11 @@ def update_status():
     user_id = request.user_id
     data = request.get_json()
     
-    user = db.get_user_by_id(user_id)
+    user = get_db().get_user_by_id(user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
         
-    user = db.update_user_status(user_id, data['status'])
+    user = get_db().update_user_status(user_id, data['status'])
     
     return jsonify(user.to_dict())
 
@@ -108,31 +114,28 @@ def search_users():
     if not query:
         return jsonify({'error': 'Search query is required'}), 400
         
-    users = db.search_users(query)
-    return jsonify([user.to_dict() for user in users]) 
+    users = get_db().search_users(query)
+    return ojsonify(users)
 
-@bp.route('/logout', methods=['OPTIONS', 'POST'])
+@bp.route('/logout', methods=['OPTIONS'])
+def logout_preflight():
+    return '', 200
+
+@bp.route('/logout', methods=['POST'])
+@auth_required
 def logout():
-    if request.method == 'OPTIONS':
-        return '', 200
-        
-    @auth_required
-    def handle_logout():
-        try:
-            auth_service = get_auth_service()
-            auth_service.logout(request.user_id)
-            return jsonify({'message': 'Logged out successfully'})
-        except Exception as e:
-            logging.error(f"Error during logout: {str(e)}")
-            return jsonify({'error': 'Logout failed'}), 500
-            
-    return handle_logout() 
+    try:
+        get_auth_service().logout(request.user_id)
+        return jsonify({'message': 'Logged out successfully'})
+    except Exception as e:
+        logger.exception("Error during logout")
+        return jsonify({'error': 'Logout failed'}), 500
 
 @bp.route('/users/name/<name>')
 @auth_required
 def get_user_by_name(name):
     """Get a user by their username."""
-    user = db.get_user_by_name(name)
+    user = get_db().get_user_by_name(name)
     if not user:
         return jsonify({'error': 'User not found'}), 404
     return jsonify(user.to_dict()) 
\ No newline at end of file
@@ -1,32 +1,54 @@
 from flask import Blueprint, request, jsonify
 from app.auth.auth_service import auth_required
-from app.db.ddb import DynamoDB
+from app.db.ddb import get_db
 from app import get_socketio
 from flask_socketio import emit, join_room, leave_room
 from werkzeug.utils import secure_filename
-from app.storage.file_storage import FileStorage
+from werkzeug.exceptions import RequestEntityTooLarge
+from app.storage.file_storage import file_storage
 import os
 from datetime import datetime, timezone
 import uuid
 from app.models.user import User
+from app.utils.responses import ojsonify
 import logging
-from ..services.qa_service import QAService
-import asyncio
+from ..services.qa_service import get_qa_service
+from app.utils.async_runner import run_async
+from concurrent.futures import ThreadPoolExecutor
 
 
 bp = Blueprint('channels', __name__)
-db = DynamoDB(table_name=os.environ.get('DYNAMODB_TABLE', 'chat_app_jrw'))
+logger = logging.getLogger(__name__)
 socketio = get_socketio()
-file_storage = FileStorage()
-qa_service = QAService()
+qa_service = get_qa_service()
+
+# Shared across requests so attachment uploads run concurrently without per-request thread startup
+_upload_pool = ThreadPoolExecutor(max_workers=16)
+# Largest message page a client may ask for in one request
+MAX_MESSAGES_LIMIT = 1000
+
+def _upload_one(file):
+    """Upload one attachment to S3, returning its stored filename or None on failure."""
+    try:
+        # Extensionless names are kept as-is rather than failing the split
+        _, ext = os.path.splitext(secure_filename(file.filename))
+        saved_filename = f"{uuid.uuid4().hex[:8]}{ext.lower()}"
+        
+        # Stream the upload straight to S3
+        if file_storage.save_file(file.stream, saved_filename):
+            return saved_filename
+        logger.error("Failed to upload %s to S3", file.filename)
+        return None
+    except Exception as e:
+        logger.error("Error handling file upload: %s", e)
+        return None
 
 @bp.route('', defaults={'trailing_slash': ''})
 @bp.route('/')
 @auth_required
 def get_channels(trailing_slash=''):
-    print("CALLED GET CHANNELS")
-    channels = db.get_channels_for_user(request.user_id)
-    return jsonify([channel.to_dict() for channel in channels])
+    channels = get_db().get_channels_for_user(request.user_id)
+    return ojsonify([channel.to_dict() for channel in channels])
 
 @bp.route('', methods=['POST'], defaults={'trailing_slash': ''})
 @bp.route('/', methods=['POST'])
@@ -42,12 +64,12 @@ def create_channel(trailing_slash=''):
     try:
         # For DM channels, check if one already exists
         if data.get('type') == 'dm' and data.get('otherUserId'):
-            existing_channel = db.get_dm_channel(user_id, data['otherUserId'])
+            existing_channel = get_db().get_dm_channel(user_id, data['otherUserId'])
             if existing_channel:
                 return jsonify(existing_channel.to_dict()), 200
 
         # Create new channel with workspace support
-        channel = db.create_channel(
+        channel = get_db().create_channel(
             name=data['name'],
             type=data.get('type', 'public'),
             created_by=user_id,
@@ -74,7 +96,7 @@ def create_channel(trailing_slash=''):
 def join_channel(channel_id):
     try:
         # Check if channel exists
-        channel = db.get_channel_by_id(channel_id)
+        channel = get_db().get_channel_by_id(channel_id)
         if not channel:
             return jsonify({'error': 'Channel not found'}), 404
             
@@ -83,13 +105,13 @@ def join_channel(channel_id):
             return jsonify({'error': 'Cannot join DM channels directly'}), 400
             
         # Add member to channel
-        db.add_channel_member(channel_id, request.user_id)
+        get_db().add_channel_member(channel_id, request.user_id)
         
-        # Join the socket room
+        # Notify sockets already in the channel room
         socketio.emit('channel.member.joined', {
             'channelId': channel_id,
             'userId': request.user_id
-        })
+        }, room=channel_id)
         
         return jsonify({'success': True}), 200
     except ValueError as e:
@@ -102,7 +124,7 @@ def join_channel(channel_id):
 def leave_channel(channel_id):
     try:
         # Check if channel exists
-        channel = db.get_channel_by_id(channel_id)
+        channel = get_db().get_channel_by_id(channel_id)
         if not channel:
             return jsonify({'error': 'Channel not found'}), 404
             
@@ -115,13 +137,13 @@ def leave_channel(channel_id):
             return jsonify({'error': 'Cannot leave DM channels'}), 400
             
         # Remove member from channel
-        db.remove_channel_member(channel_id, request.user_id)
+        get_db().remove_channel_member(channel_id, request.user_id)
         
         # Emit member left event
         socketio.emit('channel.member.left', {
             'channelId': channel_id,
             'userId': request.user_id
-        })
+        }, room=channel_id)
         
         return jsonify({'success': True}), 200
     except ValueError as e:
@@ -133,13 +155,10 @@ def leave_channel(channel_id):
 @auth_required
 def get_available_channels():
     try:
-        # Get all channels the user can join
-        channels = db.get_available_channels(request.user_id)
-        
-        # Filter out DM channels
-        channels = [c for c in channels if c.type != 'dm']
+        # Only public channels come back (GSI1 TYPE#public), so DMs never reach here
+        channels = get_db().get_available_channels(request.user_id)
         
-        return jsonify([channel.to_dict() for channel in channels])
+        return ojsonify([channel.to_dict() for channel in channels])
     except Exception as e:
         return jsonify({'error': 'Failed to get available channels'}), 500
 
@@ -147,41 +166,41 @@ def get_available_channels():
 @auth_required
 def mark_channel_read(channel_id):
     try:
-        # Check if channel exists
-        channel = db.get_channel_by_id(channel_id)
-        if not channel:
+        # Usually a channel cache hit; a cold cache costs one GetItem
+        if not get_db().get_channel_by_id(channel_id):
             return jsonify({'error': 'Channel not found'}), 404
-            
-        # Check if user is member of channel
-        if not db.is_channel_member(channel_id, request.user_id):
-            return jsonify({'error': 'Not a member of this channel'}), 403
-            
-        # Mark channel as read
-        try:
-            db.mark_channel_read(channel_id, request.user_id)
-        except Exception as e:
-            logging.error(f"Error in mark_channel_read: {str(e)}")
-            logging.error(f"Error type: {type(e)}")
-            raise
-        
+        # A read of the channel's message_count, then a conditional member write
+        get_db().mark_channel_read(channel_id, request.user_id)
         return jsonify({'success': True})
-    except ValueError as e:
-        return jsonify({'error': str(e)}), 400
+    except ValueError:
+        return jsonify({'error': 'Not a member of this channel'}), 403
     except Exception as e:
-        logging.error(f"Outer error in mark_channel_read route: {str(e)}")
-        logging.error(f"Outer error type: {type(e)}")
+        logger.exception("Error marking channel %s as read", channel_id)
         return jsonify({'error': 'Failed to mark channel as read'}), 500
 
 @bp.route('/<channel_id>/messages')
 @auth_required
 def get_channel_messages(channel_id):
-    limit = int(request.args.get('limit', 50))
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if not 1 <= limit <= MAX_MESSAGES_LIMIT:
+        return jsonify({'error': f'limit must be between 1 and {MAX_MESSAGES_LIMIT}'}), 400
+    if 'cursor' in request.args:
+        # Keyset paging: an empty cursor asks for the newest page
+        try:
+            messages, next_cursor = get_db().get_messages_page(channel_id, limit=limit, cursor=request.args['cursor'] or None)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return ojsonify({'messages': file_storage.sign_attachments(messages), 'cursor': next_cursor})
     start_time = request.args.get('start_time')
     end_time = request.args.get('end_time')
-    messages = db.get_messages(channel_id, limit=limit, start_time=start_time, end_time=end_time)
+    before = request.args.get('before')
+    messages = get_db().get_messages_raw(channel_id, limit=limit, start_time=start_time, end_time=end_time, before=before)
     if messages is None:
         return jsonify({'error': 'Failed to get messages'}), 500
-    return jsonify([message.to_dict() for message in messages])
+    return ojsonify(file_storage.sign_attachments(messages))
 
 @bp.route('/<channel_id>/messages', methods=['POST'])
 @auth_required
@@ -190,41 +209,12 @@ def create_message(channel_id):
         content = request.form.get('content', '')
         thread_id = request.form.get('thread_id')
         files = request.files.getlist('files')
-        attachments = []
-
-        # Process file uploads
-        if files:
-            for file in files:
-                if file.filename:
-                    try:
-                        filename = secure_filename(file.filename)
-                        saved_filename = str(uuid.uuid4().hex[:8]) + '.' + filename.rsplit('.', 1)[1].lower()
-                        
-                        # Use direct upload folder path
-                        upload_folder = 'uploads'
-                        save_path = os.path.join(upload_folder, saved_filename)
-                        
-                        # Ensure upload directory exists
-                        os.makedirs(upload_folder, exist_ok=True)
-                        
-                        file.save(save_path)
-                        
-                        # Upload to S3
-                        with open(save_path, 'rb') as f:
-                            if file_storage.save_file(f, saved_filename):
-                                attachments.append(saved_filename)
-                                # Clean up local file
-                                os.remove(save_path)
-                            else:
-                                raise Exception("Failed to upload file to S3")
-                    except Exception as e:
-                        logging.error(f"Error handling file upload: {str(e)}")
-                        # Clean up local file if it exists
-                        if os.path.exists(save_path):
-                            os.remove(save_path)
+        # Upload attachments in parallel; map keeps them in submission order
+        uploads = [file for file in files if file.filename]
+        attachments = [name for name in _upload_pool.map(_upload_one, uploads) if name]
 
         # Create message
-        message = db.create_message(
+        message = get_db().create_message(
             channel_id=channel_id,
             content=content,
             user_id=request.user_id,
@@ -232,15 +222,18 @@ def create_message(channel_id):
             attachments=attachments
         )
         
-        message_data = message.to_dict()
+        message_data = file_storage.sign_message(message.to_dict())
         
-        # Get channel info to check if it's a DM and emit channel.new if it's the first message
-        channel = db.get_channel_by_id(channel_id)
+        # create_message just validated the channel, so this is a cache hit; only
+        # DMs need the member query (for channel.new and persona replies)
+        channel = get_db().get_channel_by_id(channel_id)
+        if channel and channel.type == 'dm':
+            channel = get_db().get_channel_with_members(channel_id)
         if channel and channel.type == 'dm':
-            # Get all messages in channel to check if this is the first one
-            messages = db.get_messages(channel_id)
-            channel.members = db.get_channel_members(channel_id)
-            if len(messages) == 1:  # This is the first message
+            message_number = message.channel_message_number
+            if message_number is None:  # Channel predates the message counter
+                message_number = get_db().count_messages(channel_id, limit=2)
+            if message_number == 1:  # This is the first message
                 # Get channel with members for proper name display
                 socketio.emit('channel.new', channel.to_dict())
                 
@@ -249,49 +242,38 @@ def create_message(channel_id):
         socketio.emit('message.new', message_data, room=channel_id)
         
         if channel and channel.type == 'dm':
-            # get other member and see if they are a persona
-            user1 = db.get_user_by_id(channel.members[0]['id'])
-            user2 = db.get_user_by_id(channel.members[1]['id'])
-
-            other_member = user1 if user1.id != request.user_id else user2
-            
+            # get other member and see if they are a persona; the member list
+            # already says who they are, so only their user record is read
+            other_ids = [member['id'] for member in channel.members if member['id'] != request.user_id]
+            other_member = get_db().get_user_by_id(other_ids[0]) if other_ids else None
             
-            if other_member.type == 'persona':
+            if other_member and other_member.type == 'persona':
                 # get persona profile
-                asyncio.run(handle_persona_message(content, channel_id, request.user_id, other_member.id))
+                run_async(handle_persona_message(content, channel_id, request.user_id, other_member.id))
                 
         if channel and channel.type == 'bot':
             workspace_id = channel.workspace_id
             # Run the async function in the event loop
-            asyncio.run(handle_bot_message(content, workspace_id, channel_id, db.get_user_by_id(request.user_id)))
+            run_async(handle_bot_message(content, workspace_id, channel_id, get_db().get_user_by_id(request.user_id)))
             
-        return jsonify(message_data)
+        return ojsonify(message_data)
 
+    except RequestEntityTooLarge:
+        return jsonify({'error': 'Upload exceeds the size limit'}), 413
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 async def handle_bot_message(content, workspace_id, channel_id, asker: User):
     answer = await qa_service.answer_bot_message(content, workspace_id, channel_id, asker)
-    print("Answer obtained from bot: ", answer)
-    socketio.emit('message.new', answer.to_dict(), room=channel_id)
+    logger.debug("Answer obtained from bot: %s", answer)
+    socketio.emit('message.new', file_storage.sign_message(answer.to_dict()), room=channel_id)
 
 async def handle_persona_message(content, channel_id, user_id, persona_id):
-    persona_user = db.get_user_by_id(persona_id)
-    chatting_user = db.get_user_by_id(user_id)
-    print("Chatting user: ", chatting_user)
-    print("Persona user: ", persona_user)
+    persona_user = get_db().get_user_by_id(persona_id)
+    chatting_user = get_db().get_user_by_id(user_id)
     answer = await qa_service.answer_persona_message(content, channel_id, chatting_user, persona_user)
-    print("Answer obtained from persona: ", answer)
-    socketio.emit('message.new', answer.to_dict(), room=channel_id)
-
-@bp.route('/uploads/<filename>')
-def serve_file(filename):
-    """Generate a presigned URL for the file"""
-    try:
-        url = file_storage.get_file_url(filename)
-        return jsonify({'url': url}), 200
-    except ValueError as e:
-        return jsonify({'error': str(e)}), 404
+    logger.debug("Answer obtained from persona: %s", answer)
+    socketio.emit('message.new', file_storage.sign_message(answer.to_dict()), room=channel_id)
 
 # Socket.IO event handlers
 @socketio.on('channel.join')
@@ -309,9 +291,9 @@ def get_workspace_channels(workspace_id):
     try:
         user_id = request.user_id  # Get the user ID from the request
         
-        channels = db.get_workspace_channels(workspace_id, user_id)  # Pass user ID to the service function
-        print(f'Retrieving channels for workspace_id: {workspace_id}, user_id: {user_id}')
-        return jsonify([channel.to_dict() for channel in channels])
+        channels = get_db().get_workspace_channels(workspace_id, user_id)  # Pass user ID to the service function
+        logger.debug("Retrieving channels for workspace_id: %s, user_id: %s", workspace_id, user_id)
+        return ojsonify([channel.to_dict() for channel in channels])
     except Exception as e:
         return jsonify({'error': e}), 500
 
@@ -323,7 +305,7 @@ def create_bot_channel():
     workspace_id = data.get('workspace_id')
     if not workspace_id:
         return jsonify({'error': 'Workspace ID is required'}), 400
-    bot_channel = db.create_bot_channel(user_id, workspace_id)
+    bot_channel = get_db().create_bot_channel(user_id, workspace_id)
     return jsonify(bot_channel.to_dict()), 201
 
 
@@ -334,5 +316,5 @@ def get_bot_channel():
     workspace_id = request.args.get('workspace_id')
     if not workspace_id:
         return jsonify({'error': 'Workspace ID is required'}), 400
-    bot_channel = db.get_bot_channel(user_id, workspace_id)
+    bot_channel = get_db().get_bot_channel(user_id, workspace_id)
     return jsonify(bot_channel.to_dict() if bot_channel else None)
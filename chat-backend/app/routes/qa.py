@@ -1,10 +1,27 @@
 from flask import Blueprint, jsonify, request
-from ..services.qa_service import QAService
+from ..services.qa_service import get_qa_service, answer_cache_key, get_cached_answer, cache_answer
 from flask_cors import cross_origin
-from asgiref.sync import async_to_sync
+from ..utils.async_runner import run_async
+import logging
 
 bp = Blueprint('qa', __name__)
-qa_service = QAService()
+logger = logging.getLogger(__name__)
+qa_service = get_qa_service()
+
+def _answer(scope, scope_id, question, ask, get_all=False):
+    """Return a cached answer for this exact question, or run ask() and cache its result.
+
+    get_all answers are built from live DynamoDB messages rather than the vector
+    index, so they would go stale as messages arrive and are never cached.
+    """
+    if get_all:
+        return run_async(ask())
+    key = answer_cache_key(scope, scope_id, question)
+    response = get_cached_answer(key)
+    if response is None:
+        response = run_async(ask())
+        cache_answer(key, response)
+    return response
 
 @bp.route('/users/<user_id>/ask', methods=['POST'])
 @cross_origin()
@@ -16,7 +33,7 @@ def ask_about_user(user_id):
             return jsonify({"error": "Question is required"}), 400
             
         question = data['question']
-        response = async_to_sync(qa_service.ask_about_user)(user_id, question)
+        response = _answer('user', user_id, question, lambda: qa_service.ask_about_user(user_id, question))
         return jsonify(response)
         
     except ValueError as e:
@@ -34,12 +51,12 @@ def ask_about_user_by_email(email):
             return jsonify({"error": "Question is required"}), 400
             
         # Get user by email
-        user = qa_service.user_service.get_user_by_email(email)
-        if not user:
+        user_id = qa_service.user_service.get_user_id_by_email(email)
+        if not user_id:
             return jsonify({"error": "User not found"}), 404
             
         question = data['question']
-        response = async_to_sync(qa_service.ask_about_user)(user.id, question)
+        response = _answer('user', user_id, question, lambda: qa_service.ask_about_user(user_id, question))
         return jsonify(response)
         
     except ValueError as e:
@@ -57,21 +74,21 @@ def ask_about_channel(channel_id):
             return jsonify({"error": "Question is required"}), 400
         
         get_all = data.get('get_all', False)
-        print(f"\n=== Channel QA Request ===")
-        print(f"Input channel_id/name: {channel_id}")
+        logger.debug("Channel QA Request")
+        logger.debug("Input channel_id/name: %s", channel_id)
         
         # If this looks like a name rather than ID, get the channel by name
         if not channel_id.startswith('CHANNEL#'):
             channel = qa_service.channel_service.get_channel_by_id(channel_id)
             if not channel:
-                print(f"❌ No channel found with id: {channel_id}")
+                logger.debug("No channel found with id: %s", channel_id)
                 return jsonify({"error": "Channel not found"}), 404
             channel_id = channel.id
-            print(f"✓ Found channel: {channel.name} (ID: {channel_id})")
+            logger.debug("Found channel: %s (ID: %s)", channel.name, channel_id)
         
         question = data['question']
-        print(f"Question: {question}")
-        response = async_to_sync(qa_service.ask_about_channel)(channel_id, question, get_all=get_all)
+        logger.debug("Question: %s", question)
+        response = _answer('channel', channel_id, question, lambda: qa_service.ask_about_channel(channel_id, question, get_all=get_all), get_all)
         return jsonify(response)
         
     except ValueError as e:
@@ -96,7 +113,7 @@ def ask_about_channel_by_name(name):
             return jsonify({"error": "Channel not found"}), 404
         
         question = data['question']
-        response = async_to_sync(qa_service.ask_about_channel)(channel.id, question, get_all=get_all)
+        response = _answer('channel', channel.id, question, lambda: qa_service.ask_about_channel(channel.id, question, get_all=get_all), get_all)
         return jsonify(response)
         
     except ValueError as e:
@@ -115,7 +132,7 @@ def ask_about_workspace(workspace_id):
         
         get_all = data.get('get_all', False)
         question = data['question']
-        response = async_to_sync(qa_service.ask_about_workspace)(workspace_id, question, get_all=get_all)
+        response = _answer('workspace', workspace_id, question, lambda: qa_service.ask_about_workspace(workspace_id, question, get_all=get_all), get_all)
         return jsonify(response)
         
     except ValueError as e:
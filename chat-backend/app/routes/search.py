@@ -1,11 +1,11 @@
 from flask import Blueprint, request, jsonify
 from app.auth.auth_service import auth_required
-from app.db.ddb import DynamoDB
+from app.db.ddb import get_db
+from app.storage.file_storage import file_storage
 from flask_cors import cross_origin
 import os
 
 bp = Blueprint('search', __name__)
-db = DynamoDB(table_name=os.environ.get('DYNAMODB_TABLE', 'chat_app_jrw'))
 
 @bp.route('/messages', methods=['GET', 'OPTIONS'])
 @cross_origin()
@@ -20,13 +20,14 @@ def search_messages():
     if not query:
         return jsonify({'error': 'Search query is required'}), 400
         
-    messages = db.search_messages(request.user_id, query, workspace_id)
+    messages = get_db().search_messages(request.user_id, query, workspace_id)
     
-    # Enhance message data with channel info
+    # Enhance message data with channel info, fetching each distinct channel once
+    channels = get_db().get_channels_by_ids({message.channel_id for message in messages})
     response = []
     for message in messages:
-        message_data = message.to_dict()
-        channel = db.get_channel_by_id(message.channel_id)
+        message_data = file_storage.sign_message(message.to_dict())
+        channel = channels.get(message.channel_id)
         if channel:
             message_data['channel'] = channel.to_dict()
         response.append(message_data)
@@ -1,9 +1,8 @@
 from flask import Blueprint, jsonify
-from app.storage.file_storage import FileStorage
+from app.storage.file_storage import file_storage
 import os
 
 bp = Blueprint('uploads', __name__)
-file_storage = FileStorage()
 
 @bp.route('/<filename>')
 def serve_file(filename):
@@ -1,18 +1,26 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from app.auth.auth_service import auth_required
-from app.db.ddb import DynamoDB
+from app.db.ddb import get_db
 from app import get_socketio
 import os
 from datetime import datetime, timezone
+from cachetools import TTLCache
+import orjson
+import threading
+import logging
 
 bp = Blueprint('users', __name__)
-db = DynamoDB(table_name=os.environ.get('DYNAMODB_TABLE', 'chat_app_jrw'))
+logger = logging.getLogger(__name__)
 socketio = get_socketio()
 
+PERSONAS_MAX_AGE = 300
+_PERSONAS_CACHE = TTLCache(maxsize=1, ttl=PERSONAS_MAX_AGE)
+_PERSONAS_LOCK = threading.Lock()
+
 @bp.route('/', strict_slashes=False)
 @auth_required
 def get_users():
-    users = db.user_service.get_all_users()
+    users = get_db().user_service.get_all_users()
     return jsonify(users)
 
 @bp.route('/status', methods=['PUT'], strict_slashes=False)
@@ -20,7 +28,7 @@ def get_users():
 def update_status():
     """Update the current user's status"""
     data = request.get_json()
-    print(f"[STATUS] 1. Request received with data: {data}")
+    logger.debug("Status update requested: %s", data)
     
     if 'status' not in data:
         return jsonify({'error': 'Status is required'}), 400
@@ -30,12 +38,10 @@ def update_status():
         return jsonify({'error': f'Invalid status. Must be one of: {", ".join(valid_statuses)}'}), 400
     
     try:
-        print(f"[STATUS] 2. Updating user {request.user_id} to status: {data['status']}")
-        user = db.update_user_status(request.user_id, data['status'])
+        user = get_db().update_user_status(request.user_id, data['status'])
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
-        print(f"[STATUS] 3. User object after update: {user.to_dict()}")
         user_dict = user.to_dict()
         
         # Use the requested status directly, not the one from the user object
@@ -45,24 +51,35 @@ def update_status():
             'lastActive': user_dict['lastActive']
         }
         
-        print(f"[STATUS] 4. Emitting status update: {status_update}")
+        logger.debug("Emitting status update: %s", status_update)
         socketio.emit('user.status', status_update)
         
         return jsonify(user_dict)
     except Exception as e:
-        print(f"[STATUS] ERROR: {str(e)}")
+        logger.exception("Error updating status for user %s", request.user_id)
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/me', strict_slashes=False)
 @auth_required
 def get_current_user():
     """Get current user's data"""
-    user = db.get_user_by_id(request.user_id)
+    user = get_db().get_user_by_id(request.user_id)
     if not user:
         return jsonify({'error': 'User not found'}), 404
     return jsonify(user.to_dict())
 
 @bp.route('/personas', methods=['GET'], strict_slashes=False)
 def get_personas():
-    persona_users = db.user_service.get_all_personas()  
-    return jsonify([persona.to_dict() for persona in persona_users])
+    # The persona roster is effectively static; serve pre-encoded bytes and let
+    # browsers and proxies hold on to them too
+    with _PERSONAS_LOCK:
+        body = _PERSONAS_CACHE.get('personas')
+    if body is None:
+        persona_users = get_db().user_service.get_all_personas()
+        body = orjson.dumps([persona.to_dict() for persona in persona_users])
+        with _PERSONAS_LOCK:
+            _PERSONAS_CACHE['personas'] = body
+    response = Response(body, mimetype='application/json')
+    response.cache_control.public = True
+    response.cache_control.max_age = PERSONAS_MAX_AGE
+    return response
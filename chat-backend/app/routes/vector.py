@@ -1,22 +1,57 @@
-from flask import Blueprint, jsonify, request
-from ..services.vector_service import VectorService
-from ..services.user_service import UserService
-from ..services.channel_service import ChannelService
+import functools
+import hashlib
+import itertools
+import orjson
+from flask import Blueprint, Response, jsonify, request
+from ..services.vector_service import get_vector_service
+from ..services.qa_service import clear_answer_cache
 from flask_cors import cross_origin
-from asgiref.sync import async_to_sync
+from ..utils.async_runner import iterate_async, run_async
 from datetime import datetime
+from typing import Optional
 
 bp = Blueprint('vector', __name__)
-vector_service = VectorService()
-user_service = UserService()
-channel_service = ChannelService()
+vector_service = get_vector_service()
+user_service = vector_service.user_service
+channel_service = vector_service.channel_service
+
+@functools.lru_cache(maxsize=256)
+def parse_iso_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO date from a request body; operators re-send the same windows."""
+    return datetime.fromisoformat(value) if value else None
+
+def _index_options():
+    """Read (start_date, end_date, is_grouped) from an index request's JSON body."""
+    payload = request.get_json(silent=True) or {}
+    return (
+        parse_iso_date(payload.get('start_date')),
+        parse_iso_date(payload.get('end_date')),
+        payload.get('is_grouped', False),
+    )
+
+def _conditional_json(key, produce):
+    """Serve produce() as JSON with an ETag over key and the index version.
+
+    A matching If-None-Match gets a 304 without running the (vector) lookup.
+    The version lives in the table, so reindexes by any process change the tag.
+    """
+    etag = hashlib.md5(repr((key, vector_service.index_version())).encode()).hexdigest()
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = jsonify(produce())
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = 60
+    return response
 
 @bp.route('/users/<user_id>/index', methods=['POST'])
 @cross_origin()
 def index_user(user_id):
     """Index a user's profile in the vector database"""
     try:
-        result = async_to_sync(vector_service.index_user)(user_id)
+        result = run_async(vector_service.index_user(user_id))
+        clear_answer_cache()
         return jsonify(result)
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
@@ -28,11 +63,12 @@ def index_user(user_id):
 def index_user_by_email(email):
     """Index a user's profile by email"""
     try:
-        user = user_service.get_user_by_email(email)
-        if not user:
+        user_id = user_service.get_user_id_by_email(email)
+        if not user_id:
             return jsonify({"error": f"User with email '{email}' not found"}), 404
             
-        result = async_to_sync(vector_service.index_user)(user.id)
+        result = run_async(vector_service.index_user(user_id))
+        clear_answer_cache()
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -46,15 +82,10 @@ def index_channel_by_name(name):
         if not channel:
             return jsonify({"error": f"Channel '{name}' not found"}), 404
 
-        start_date = request.json.get('start_date')
-        end_date = request.json.get('end_date')
-        is_grouped = request.json.get('is_grouped', False)
+        start_date, end_date, is_grouped = _index_options()
 
-        # Convert date strings to datetime objects
-        start_date = datetime.fromisoformat(start_date) if start_date else None
-        end_date = datetime.fromisoformat(end_date) if end_date else None
-
-        async_to_sync(vector_service.index_channel)(channel.id, start_date, end_date, is_grouped)
+        run_async(vector_service.index_channel(channel.id, start_date, end_date, is_grouped))
+        clear_answer_cache()
         return jsonify({'status': 'success'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -74,12 +105,11 @@ def search_similar():
             
         limit = request.args.get('limit', default=10, type=int)
         
-        results = async_to_sync(vector_service.search_similar)(
+        return _conditional_json(('search', query, doc_type, limit), lambda: run_async(vector_service.search_similar(
             query=query,
             doc_type=doc_type,
             limit=limit
-        )
-        return jsonify(results)
+        )))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -89,11 +119,10 @@ def get_user_context(user_id):
     """Get a user's context including profile and messages"""
     try:
         include_profile = request.args.get('include_profile', default='true').lower() == 'true'
-        context = async_to_sync(vector_service.get_user_context)(
+        return _conditional_json(('context', user_id, include_profile), lambda: run_async(vector_service.get_user_context(
             user_id=user_id,
             include_profile=include_profile
-        )
-        return jsonify(context)
+        )))
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -104,51 +133,68 @@ def get_user_context(user_id):
 def get_user_context_by_email(email):
     """Get a user's context by email"""
     try:
-        user = user_service.get_user_by_email(email)
-        if not user:
+        user_id = user_service.get_user_id_by_email(email)
+        if not user_id:
             return jsonify({"error": f"User with email '{email}' not found"}), 404
             
         include_profile = request.args.get('include_profile', default='true').lower() == 'true'
-        context = async_to_sync(vector_service.get_user_context)(
-            user_id=user.id,
+        return _conditional_json(('context', user_id, include_profile), lambda: run_async(vector_service.get_user_context(
+            user_id=user_id,
             include_profile=include_profile
-        )
-        return jsonify(context)
+        )))
     except Exception as e:
         return jsonify({"error": str(e)}), 500 
 
 @bp.route('/workspaces/<workspace_id>/index', methods=['POST'])
 @cross_origin()
 def index_workspace(workspace_id):
-    """Index a workspace's channels with optional parameters"""
-    try:
-        start_date = request.json.get('start_date')
-        end_date = request.json.get('end_date')
-        is_grouped = request.json.get('is_grouped', False)
+    """Index a workspace's channels with optional parameters
 
-        # Convert date strings to datetime objects
-        start_date = datetime.fromisoformat(start_date) if start_date else None
-        end_date = datetime.fromisoformat(end_date) if end_date else None
+    Streams newline-delimited JSON: one line per channel as it finishes, then a
+    summary line, so long runs report progress instead of holding the request open.
+    """
+    try:
+        start_date, end_date, is_grouped = _index_options()
 
-        async_to_sync(vector_service.index_workspace)(workspace_id, start_date, end_date, is_grouped)
-        return jsonify({'status': 'success'})
+        progress = iterate_async(vector_service.index_workspace_progress(workspace_id, start_date, end_date, is_grouped))
+        # Pull the first result here so an unknown workspace is still a plain error response
+        first = next(progress, None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+    def generate():
+        indexed = 0
+        errors = 0
+        results = itertools.chain([first], progress) if first else progress
+        for channel, result in results:
+            line = {'channel_id': channel.id, 'channel': channel.name}
+            if isinstance(result, Exception):
+                errors += 1
+                line['error'] = str(result)
+            else:
+                indexed += result
+                line['messages_indexed'] = result
+            yield orjson.dumps(line) + b'\n'
+        clear_answer_cache()
+        yield orjson.dumps({
+            'status': 'error' if errors else 'success',
+            'messages_indexed': indexed,
+            'errors': errors,
+        }) + b'\n'
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
 @bp.route('/workspaces/index', methods=['POST'])
 @cross_origin()
 def index_all_workspaces():
     """Index all workspaces with optional start and end dates"""
     try:
-        start_date = request.json.get('start_date')
-        end_date = request.json.get('end_date')
-        is_grouped = request.json.get('is_grouped', False)
-
-        # Convert date strings to datetime objects
-        start_date = datetime.fromisoformat(start_date) if start_date else None
-        end_date = datetime.fromisoformat(end_date) if end_date else None
+        start_date, end_date, is_grouped = _index_options()
 
-        async_to_sync(vector_service.index_all_workspaces)(start_date, end_date, is_grouped)
+        run_async(vector_service.index_all_workspaces(start_date, end_date, is_grouped))
+        clear_answer_cache()
         return jsonify({'status': 'success'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500 
\ No newline at end of file
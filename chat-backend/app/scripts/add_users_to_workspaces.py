@@ -1,40 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
 from app.services.workspace_service import WorkspaceService
 from app.services.channel_service import ChannelService
-from app.services.user_service import UserService
+
+# Workspaces are independent; the services share one DynamoDB resource and pool
+MAX_WORKERS = 8
 
 # Initialize services
 workspace_service = WorkspaceService()
-channel_service = ChannelService()
-user_service = UserService()
-
-# Get all workspaces
-workspaces = workspace_service.get_all_workspaces()
+channel_service = ChannelService(workspace_service=workspace_service)
 
-for workspace in workspaces:
+def process_workspace(workspace) -> str:
+    """Add every channel member of the workspace who lacks a workspace member record."""
     workspace_id = workspace.id
-    print(f"Processing workspace: {workspace_id}")
-    
+
     # Get all channels in the workspace
     channels = channel_service.get_workspace_channels(workspace_id)
-    
-    # Track users already added to the workspace
-    added_users = set(workspace_service.get_users_by_workspace(workspace_id))
-    
-    for channel in channels:
-        channel_id = channel.id
-        print(f"  Processing channel: {channel_id}")
-        
-        # Get all users in the channel
-        users = channel_service.get_channel_members(channel_id)
-        
-        for user in users:
-            user_id = user['id']
-            if user_id not in added_users:
-                # Add user to workspace
-                workspace_service.add_user_to_workspace(workspace_id, user_id)
-                added_users.add(user_id)
-                print(f"    Added user {user_id} to workspace {workspace_id}")
-            else:
-                print(f"    User {user_id} already in workspace {workspace_id}")
-
-print("Completed processing all workspaces.") 
\ No newline at end of file
+
+    # Collect everyone who is in at least one of the workspace's channels
+    member_ids = channel_service.get_member_ids_for_channels([channel.id for channel in channels])
+    channel_user_ids = {user_id for ids in member_ids.values() for user_id in ids}
+
+    # Add the users without a workspace member record in one batched write
+    missing_user_ids = channel_user_ids - workspace_service.get_workspace_member_ids(workspace_id)
+    workspace_service.add_users_to_workspace(workspace_id, missing_user_ids)
+
+    # Report per workspace once done, so output from concurrent workers doesn't interleave
+    lines = [f"Processed workspace: {workspace_id} ({len(channels)} channels)"]
+    lines.extend(f"    Added user {user_id} to workspace {workspace_id}" for user_id in missing_user_ids)
+    lines.append(f"  {len(channel_user_ids) - len(missing_user_ids)} users already in workspace {workspace_id}")
+    return "\n".join(lines)
+
+# Get all workspaces
+workspaces = workspace_service.get_all_workspaces()
+
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    for report in executor.map(process_workspace, workspaces):
+        print(report)
+
+print("Completed processing all workspaces.")
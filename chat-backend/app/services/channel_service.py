@@ -24,26 +24,39 @@ from datetime import datetime, timezone
 import uuid
 import logging
 from boto3.dynamodb.conditions import Key, Attr
+from botocore.exceptions import ClientError
 from .base_service import BaseService
 from .user_service import UserService
 from .workspace_service import WorkspaceService
 from ..models.channel import Channel
 from ..models.workspace import Workspace
 import time
-import boto3
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Process-wide caches shared by every ChannelService instance, keyed by table name.
+# Channel metadata and memberships rarely change, so short-lived entries skip most
+# GetItems. Only positive memberships are cached, so a join seen by another worker
+# is never hidden; remove_channel_member drops its own entry, but a removal made by
+# another process keeps granting access here until the entry expires. Cached
+# channels may carry a message_count up to a minute old.
+_CHANNEL_CACHE = TTLCache(maxsize=10_000, ttl=60)
+_MEMBER_CACHE = TTLCache(maxsize=100_000, ttl=60)
+# Channel names never change after creation, so name -> id can live longer
+_CHANNEL_NAME_CACHE = TTLCache(maxsize=1024, ttl=300)
+_CACHE_LOCK = threading.Lock()
+# Shared by fan-out reads (e.g. per-channel unread counts); boto3 clients are thread-safe
+_QUERY_POOL = ThreadPoolExecutor(max_workers=16)
 
 class ChannelService(BaseService):
-    def __init__(self, table_name: str = None):
+    def __init__(self, table_name: str = None, user_service: Optional[UserService] = None, workspace_service: Optional[WorkspaceService] = None):
+        """Pass user_service/workspace_service to share the caller's instances."""
         super().__init__(table_name)
-        self.user_service = UserService(table_name)
-        self.workspace_service = WorkspaceService(table_name)
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION')
-        )
+        self.user_service = user_service or UserService(table_name)
+        self.workspace_service = workspace_service or WorkspaceService(table_name)
 
     def _clean_item(self, item: Dict) -> Dict:
         """Clean DynamoDB item for channel model creation"""
@@ -85,23 +98,30 @@ class ChannelService(BaseService):
             if response.get('Items'):
                 raise ValueError("Channel name already exists")
         
+        channel_key = f'CHANNEL#{channel_id}'
         item = {
-            'PK': f'CHANNEL#{channel_id}',
+            'PK': channel_key,
             'SK': '#METADATA',
             'GSI1PK': f'TYPE#{type}',
             'GSI1SK': f'NAME#{name}',
             'GSI4PK': f'WORKSPACE#{workspace_id}',
-            'GSI4SK': f'CHANNEL#{channel_id}',
+            'GSI4SK': channel_key,
             'id': channel_id,
             'name': name,
             'type': type,
             'created_by': created_by,
             'created_at': timestamp,
             'workspace_id': workspace_id,
-            'members': []
+            'members': [],
+            'message_count': 0
         }
         
         self.table.put_item(Item=item)
+        channel_data = self._clean_item(item)
+        # Seed the cache so the add_channel_member calls below don't each re-read
+        # the item that was just written
+        with _CACHE_LOCK:
+            _CHANNEL_CACHE[(self.table.name, channel_id)] = channel_data
         
         # Add creator to channel
         if created_by:
@@ -116,12 +136,18 @@ class ChannelService(BaseService):
             self.add_channel_member(channel_id, bot_user.id)
             
         # Get channel with members
-        channel = Channel(**self._clean_item(item))
+        channel = Channel(**channel_data)
         channel.members = self.get_channel_members(channel_id)
         return channel
 
     def get_channel_by_id(self, channel_id: str) -> Optional[Channel]:
         """Get a channel by its ID."""
+        cache_key = (self.table.name, channel_id)
+        with _CACHE_LOCK:
+            channel_data = _CHANNEL_CACHE.get(cache_key)
+        if channel_data is not None:
+            return Channel(**channel_data)
+            
         try:
             response = self.table.get_item(
                 Key={
@@ -133,71 +159,84 @@ class ChannelService(BaseService):
             if 'Item' not in response:
                 return None
                 
-            item = response['Item']
-            return Channel(**self._clean_item(item))
+            channel_data = self._clean_item(response['Item'])
+            with _CACHE_LOCK:
+                _CHANNEL_CACHE[cache_key] = channel_data
+            return Channel(**channel_data)
         except Exception as e:
-            logging.error(f"Error getting channel by ID: {str(e)}")
+            logger.exception("Error getting channel by ID %s", channel_id)
             raise
 
+    def get_channels_by_ids(self, channel_ids) -> Dict[str, Channel]:
+        """Get several channels by ID, keyed by ID.
+        
+        Cached channels are served from the channel cache; the rest are read with
+        BatchGetItem and cached. Missing channels are omitted.
+        """
+        channels = {}
+        missing = []
+        with _CACHE_LOCK:
+            for channel_id in set(channel_ids):
+                channel_data = _CHANNEL_CACHE.get((self.table.name, channel_id))
+                if channel_data is not None:
+                    channels[channel_id] = Channel(**channel_data)
+                else:
+                    missing.append(channel_id)
+                    
+        for item in self._batch_get_items(
+            [{'PK': f'CHANNEL#{channel_id}', 'SK': '#METADATA'} for channel_id in missing]
+        ):
+            channel_data = self._clean_item(item)
+            with _CACHE_LOCK:
+                _CHANNEL_CACHE[(self.table.name, channel_data['id'])] = channel_data
+            channels[channel_data['id']] = Channel(**channel_data)
+                
+        return channels
+
     def get_channels_for_user(self, user_id: str) -> List[Channel]:
         """Get all channels a user is a member of."""
-        # Query GSI2 to get all channels for user
-        response = self.table.query(
-            IndexName='GSI2',
-            KeyConditionExpression=Key('GSI2PK').eq(f'USER#{user_id}')
-        )
-        
-        # Get channel IDs and last_read timestamps
-        channel_data = {
-            item['GSI2SK'].split('#')[1]: item.get('last_read')
-            for item in response['Items']
+        # Query GSI2 to get all channels for user. Membership items carry last_read
+        # and, once the channel has been marked read, read_count (the channel's
+        # message_count at that moment); nothing else on them is needed
+        query_params = {
+            'IndexName': 'GSI2',
+            'KeyConditionExpression': Key('GSI2PK').eq(f'USER#{user_id}') & 
+                                    Key('GSI2SK').begins_with('CHANNEL#'),
+            'ProjectionExpression': 'GSI2SK, last_read, read_count'
         }
-        channel_ids = list(channel_data.keys())
+        memberships = {}
+        while True:
+            response = self.table.query(**query_params)
+            for item in response['Items']:
+                memberships[item['GSI2SK'].split('#')[1]] = item
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        channel_ids = list(memberships.keys())
         
         if not channel_ids:
             return []
             
+        # With a read_count the unread count is message_count - read_count off the
+        # metadata item. The rest need one COUNT query per channel; start those on
+        # the pool so they run side by side and overlap the metadata batch below
+        counted_ids = [channel_id for channel_id in channel_ids if 'read_count' not in memberships[channel_id]]
+        unread_results = _QUERY_POOL.map(
+            lambda channel_id: self._count_unread(channel_id, memberships[channel_id].get('last_read')),
+            counted_ids
+        )
+        
         # Batch get channel metadata
-        channels_data = []
-        for i in range(0, len(channel_ids), 100):
-            batch_ids = channel_ids[i:i+100]
-            response = self.table.meta.client.batch_get_item(
-                RequestItems={
-                    self.table.name: {
-                        'Keys': [
-                            {
-                                'PK': f'CHANNEL#{channel_id}',
-                                'SK': '#METADATA'
-                            }
-                            for channel_id in batch_ids
-                        ]
-                    }
-                }
-            )
-            if 'Responses' in response and self.table.name in response['Responses']:
-                channels_data.extend(response['Responses'][self.table.name])
-        
-        # Get unread counts for each channel
-        unread_counts = {}
-        for channel_id in channel_ids:
-            last_read = channel_data[channel_id]
-            if last_read:
-                # Query messages after last_read
-                response = self.table.query(
-                    IndexName='GSI1',
-                    KeyConditionExpression=Key('GSI1PK').eq(f'CHANNEL#{channel_id}') & 
-                                         Key('GSI1SK').gt(f'TS#{last_read}'),
-                    Select='COUNT'
-                )
-                unread_counts[channel_id] = response['Count']
-            else:
-                # If no last_read, all messages are unread
-                response = self.table.query(
-                    IndexName='GSI1',
-                    KeyConditionExpression=Key('GSI1PK').eq(f'CHANNEL#{channel_id}'),
-                    Select='COUNT'
-                )
-                unread_counts[channel_id] = response['Count']
+        channels_data = self._batch_get_items(
+            [{'PK': f'CHANNEL#{channel_id}', 'SK': '#METADATA'} for channel_id in channel_ids]
+        )
+        
+        unread_counts = dict(zip(counted_ids, unread_results))
+        
+        # Members are only listed for DM channels; resolve their users in one batch
+        dm_members = self.get_members_for_channels(
+            [item['id'] for item in channels_data if item.get('type') == 'dm']
+        )
         
         # Process channels
         channels = []
@@ -206,24 +245,63 @@ class ChannelService(BaseService):
             channel_id = channel_data['id']
             
             # Add unread count
-            channel_data['unread_count'] = unread_counts.get(channel_id, 0)
+            membership = memberships[channel_id]
+            if channel_id in unread_counts:
+                channel_data['unread_count'] = unread_counts[channel_id]
+            elif 'message_count' in channel_data:
+                channel_data['unread_count'] = max(0, int(channel_data['message_count']) - int(membership['read_count']))
+            else:
+                channel_data['unread_count'] = self._count_unread(channel_id, membership.get('last_read'))
             
             # Add members for DM channels
             if channel_data.get('type') == 'dm':
-                channel_data['members'] = self.get_channel_members(channel_data['id'])
+                channel_data['members'] = dm_members.get(channel_id, [])
                 
             channels.append(Channel(**channel_data))
             
         return channels
 
+    def _count_unread(self, channel_id: str, last_read: Optional[str]) -> int:
+        """Count a channel's messages after last_read (all of them if never read)."""
+        key_condition = Key('GSI1PK').eq(f'CHANNEL#{channel_id}')
+        if last_read:
+            key_condition = key_condition & Key('GSI1SK').gt(f'TS#{last_read}')
+        query_params = {
+            'IndexName': 'GSI1',
+            'KeyConditionExpression': key_condition,
+            'Select': 'COUNT'
+        }
+        count = 0
+        while True:
+            response = self.table.query(**query_params)
+            count += response['Count']
+            if 'LastEvaluatedKey' not in response:
+                return count
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def get_channel_ids_for_user(self, user_id: str) -> set:
+        """Get the IDs of all channels a user is a member of.
+        
+        One GSI2 query over the user's membership keys; the user's messages share
+        GSI2PK=USER#{id}, so the sort key is limited to CHANNEL#.
+        """
+        query_params = {
+            'IndexName': 'GSI2',
+            'KeyConditionExpression': Key('GSI2PK').eq(f'USER#{user_id}') & 
+                                    Key('GSI2SK').begins_with('CHANNEL#'),
+            'ProjectionExpression': 'GSI2SK'  # Only get channel IDs
+        }
+        channel_ids = set()
+        while True:
+            response = self.table.query(**query_params)
+            channel_ids.update(item['GSI2SK'].split('#')[1] for item in response['Items'])
+            if 'LastEvaluatedKey' not in response:
+                return channel_ids
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
     def get_available_channels(self, user_id: str) -> List[Channel]:
         """Get public channels the user is not a member of."""
-        # Query GSI2 for user's channel memberships (just need IDs)
-        membership_response = self.table.query(
-            IndexName='GSI2',
-            KeyConditionExpression=Key('GSI2PK').eq(f'USER#{user_id}'),
-            ProjectionExpression='GSI2SK'  # Only get channel IDs
-        )
+        user_channel_ids = self.get_channel_ids_for_user(user_id)
         
         # Query GSI1 for public channels
         public_response = self.table.query(
@@ -231,9 +309,6 @@ class ChannelService(BaseService):
             KeyConditionExpression=Key('GSI1PK').eq('TYPE#public')
         )
         
-        # Process results
-        user_channel_ids = {item['GSI2SK'].split('#')[1] for item in membership_response['Items']}
-        
         channels = []
         for item in public_response['Items']:
             channel_id = item['id']
@@ -243,45 +318,53 @@ class ChannelService(BaseService):
         return channels
 
     def get_dm_channel(self, user1_id: str, user2_id: str) -> Optional[Channel]:
-        """Get the DM channel between two users if it exists."""
+        """Get the DM channel between two users if it exists.
+        
+        DM names are the sorted user IDs, so a pair maps to exactly one GSI1 key;
+        like other names, a found DM's ID is cached so reopening it skips the query.
+        """
         user_ids = sorted([user1_id, user2_id])
         dm_name = f"dm_{user_ids[0]}_{user_ids[1]}"
         
-        response = self.table.query(
-            IndexName='GSI1',
-            KeyConditionExpression=Key('GSI1PK').eq('TYPE#dm') & 
-                                 Key('GSI1SK').eq(f'NAME#{dm_name}')
-        )
+        cache_key = (self.table.name, dm_name)
+        with _CACHE_LOCK:
+            channel_id = _CHANNEL_NAME_CACHE.get(cache_key)
+        channel = self.get_channel_by_id(channel_id) if channel_id else None
         
-        if not response['Items']:
-            return None
+        if channel is None or channel.type != 'dm':
+            response = self.table.query(
+                IndexName='GSI1',
+                KeyConditionExpression=Key('GSI1PK').eq('TYPE#dm') & 
+                                     Key('GSI1SK').eq(f'NAME#{dm_name}'),
+                Limit=1
+            )
+            
+            if not response['Items']:
+                return None
+                
+            channel_data = self._clean_item(response['Items'][0])
+            with _CACHE_LOCK:
+                _CHANNEL_NAME_CACHE[cache_key] = channel_data['id']
+                _CHANNEL_CACHE[(self.table.name, channel_data['id'])] = channel_data
+            channel = Channel(**channel_data)
             
-        channel = Channel(**self._clean_item(response['Items'][0]))
         channel.members = self.get_channel_members(channel.id)
         return channel
 
     def add_channel_member(self, channel_id: str, user_id: str) -> None:
         """Add a member to a channel."""
+        # Check the user while the (usually cached) channel lookup runs
+        user_lookup = _QUERY_POOL.submit(self.user_service.get_user_by_id, user_id)
+        
         # First check if channel exists
         channel = self.get_channel_by_id(channel_id)
         if not channel:
             raise ValueError("Channel not found")
         
         # Check if user exists
-        user = self.user_service.get_user_by_id(user_id)
-        if not user:
+        if not user_lookup.result():
             raise ValueError("User not found")
         
-        # Check if user is already a member
-        response = self.table.get_item(
-            Key={
-                'PK': f'CHANNEL#{channel_id}',
-                'SK': f'MEMBER#{user_id}'
-            }
-        )
-        if 'Item' in response:
-            raise ValueError("User is already a member")
-        
         timestamp = self._now()
         item = {
             'PK': f'CHANNEL#{channel_id}',
@@ -292,55 +375,218 @@ class ChannelService(BaseService):
             'last_read': timestamp
         }
         
+        # Let DynamoDB reject duplicates instead of probing with a GetItem first
         try:
-            self.table.put_item(Item=item)
-        except Exception as e:
-            logging.error(f"Error adding channel member: {str(e)}")
+            self.table.put_item(
+                Item=item,
+                ConditionExpression='attribute_not_exists(SK)'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                raise ValueError("User is already a member")
+            logger.exception("Error adding user %s to channel %s", user_id, channel_id)
             raise
+        
+        with _CACHE_LOCK:
+            _MEMBER_CACHE[(self.table.name, channel_id, user_id)] = True
+
+    def remove_channel_member(self, channel_id: str, user_id: str) -> None:
+        """Remove a member from a channel."""
+        try:
+            self.table.delete_item(
+                Key={
+                    'PK': f'CHANNEL#{channel_id}',
+                    'SK': f'MEMBER#{user_id}'
+                },
+                ConditionExpression='attribute_exists(SK)'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                raise ValueError("User is not a member")
+            logger.exception("Error removing user %s from channel %s", user_id, channel_id)
+            raise
+        finally:
+            # Drop the cached membership even if the row was already gone
+            with _CACHE_LOCK:
+                _MEMBER_CACHE.pop((self.table.name, channel_id, user_id), None)
 
     def get_channel_members(self, channel_id: str) -> List[dict]:
         """Get members of a channel"""
-        # Get member records
-        response = self.table.query(
-            KeyConditionExpression=Key('PK').eq(f'CHANNEL#{channel_id}') & 
-                                 Key('SK').begins_with('MEMBER#')
-        )
+        return self.get_members_for_channels([channel_id]).get(channel_id, [])
+
+    def get_members_for_channels(self, channel_ids: List[str]) -> Dict[str, List[dict]]:
+        """Get members of several channels, keyed by channel ID.
         
-        if not response['Items']:
-            return []
+        Member records are queried per channel, concurrently, and the user
+        records behind them are fetched in a single batch across all channels.
+        """
+        def query_members(channel_id: str) -> List[Dict]:
+            query_params = {
+                'KeyConditionExpression': Key('PK').eq(f'CHANNEL#{channel_id}') & 
+                                        Key('SK').begins_with('MEMBER#'),
+                # Only what _resolve_members reads, not the GSI2 keys
+                'ProjectionExpression': 'SK, joined_at, last_read'
+            }
+            items = []
+            while True:
+                response = self.table.query(**query_params)
+                items.extend(response['Items'])
+                if 'LastEvaluatedKey' not in response:
+                    return items
+                query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
             
-        # Extract user IDs and batch get user data
-        user_ids = [item['SK'].split('#')[1] for item in response['Items']]
+        # One query per channel, issued side by side on the shared pool
+        member_items = dict(zip(channel_ids, _QUERY_POOL.map(query_members, channel_ids)))
+        return self._resolve_members(member_items)
+
+    def get_member_ids_for_channels(self, channel_ids: List[str]) -> Dict[str, List[str]]:
+        """Get the member user IDs of several channels, keyed by channel ID.
+        
+        Only the member keys are read and no user records are fetched, for
+        callers that just need to know who is in the channels. Channels are
+        queried concurrently on the shared pool.
+        """
+        def query_member_ids(channel_id: str) -> List[str]:
+            query_params = {
+                'KeyConditionExpression': Key('PK').eq(f'CHANNEL#{channel_id}') & 
+                                        Key('SK').begins_with('MEMBER#'),
+                'ProjectionExpression': 'SK'
+            }
+            ids = []
+            while True:
+                response = self.table.query(**query_params)
+                ids.extend(item['SK'].split('#')[1] for item in response['Items'])
+                if 'LastEvaluatedKey' not in response:
+                    return ids
+                query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+                
+        return dict(zip(channel_ids, _QUERY_POOL.map(query_member_ids, channel_ids)))
+
+    def _resolve_members(self, member_items: Dict[str, List[Dict]]) -> Dict[str, List[dict]]:
+        """Turn member items, keyed by channel ID, into member dicts with one user batch."""
+        # Extract user IDs and batch get user data; members only need identity
+        # fields, so recently read users come from the user cache
+        user_ids = {
+            item['SK'].split('#')[1]
+            for items in member_items.values()
+            for item in items
+        }
         users = {
             user.id: user 
-            for user in self.user_service._batch_get_users(user_ids)
+            for user in self.user_service._batch_get_users(user_ids, cached=True)
         }
         
         # Process members
-        members = []
+        members_by_channel = {}
+        for channel_id, items in member_items.items():
+            members = []
+            for item in items:
+                user_id = item['SK'].split('#')[1]
+                if user_id in users:
+                    user = users[user_id]
+                    members.append({
+                        'id': user.id,
+                        'name': user.name,
+                        'email': user.email,
+                        'joined_at': item.get('joined_at'),
+                        'last_read': item.get('last_read')
+                    })
+            members_by_channel[channel_id] = members
+                
+        return members_by_channel
+
+    def get_channel_with_members(self, channel_id: str, member_types: Optional[set] = None) -> Optional[Channel]:
+        """Get a channel and its members from a single partition query.
+        
+        The metadata and member items share the CHANNEL#{id} partition, so one
+        Query returns both. member_types limits member resolution to those
+        channel types (e.g. {'dm'}); other channels come back without members.
+        """
+        response = self.table.query(
+            KeyConditionExpression=Key('PK').eq(f'CHANNEL#{channel_id}')
+        )
+        
+        metadata = None
+        member_items = []
         for item in response['Items']:
-            user_id = item['SK'].split('#')[1]
-            if user_id in users:
-                user = users[user_id]
-                members.append({
-                    'id': user.id,
-                    'name': user.name,
-                    'email': user.email,
-                    'joined_at': item.get('joined_at'),
-                    'last_read': item.get('last_read')
-                })
+            if item['SK'] == '#METADATA':
+                metadata = item
+            elif item['SK'].startswith('MEMBER#'):
+                member_items.append(item)
                 
-        return members
+        if not metadata:
+            return None
+            
+        channel = Channel(**self._clean_item(metadata))
+        if member_types is None or channel.type in member_types:
+            channel.members = self._resolve_members({channel_id: member_items})[channel_id]
+        return channel
 
     def get_channel_message_count(self, channel_id: str) -> int:
-        """Get the number of messages in a channel."""
-        response = self.table.query(
-            IndexName='GSI1',
-            KeyConditionExpression=Key('GSI1PK').eq(f'CHANNEL#{channel_id}'),
-            Select='COUNT'
+        """Get the number of messages in a channel.
+        
+        Reads the counter maintained by increment_message_count, falling back
+        to counting GSI1 for channels created before the counter existed.
+        """
+        response = self.table.get_item(
+            Key={
+                'PK': f'CHANNEL#{channel_id}',
+                'SK': '#METADATA'
+            },
+            ProjectionExpression='message_count'
         )
+        item = response.get('Item')
+        if item and 'message_count' in item:
+            return int(item['message_count'])
         
-        return response['Count']
+        return self.count_messages(channel_id)
+
+    def count_messages(self, channel_id: str, limit: Optional[int] = None) -> int:
+        """Count a channel's messages on GSI1, stopping once limit is reached.
+        
+        Select='COUNT' returns no item bodies, and a small limit (e.g. 2 to
+        tell a first message apart) lets DynamoDB stop after that many items.
+        """
+        query_params = {
+            'IndexName': 'GSI1',
+            'KeyConditionExpression': Key('GSI1PK').eq(f'CHANNEL#{channel_id}'),
+            'Select': 'COUNT'
+        }
+        count = 0
+        while True:
+            if limit is not None:
+                query_params['Limit'] = limit - count
+            response = self.table.query(**query_params)
+            count += response['Count']
+            
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key or (limit is not None and count >= limit):
+                return count
+            query_params['ExclusiveStartKey'] = last_evaluated_key
+
+    def increment_message_count(self, channel_id: str) -> Optional[int]:
+        """Bump the channel's message counter and return the new count.
+        
+        Channels without a counter are left alone (returning None) so
+        get_channel_message_count keeps counting them instead of reporting a
+        partial total.
+        """
+        try:
+            response = self.table.update_item(
+                Key={
+                    'PK': f'CHANNEL#{channel_id}',
+                    'SK': '#METADATA'
+                },
+                UpdateExpression='SET message_count = message_count + :one',
+                ConditionExpression='attribute_exists(message_count)',
+                ExpressionAttributeValues={':one': 1},
+                ReturnValues='UPDATED_NEW'
+            )
+            return int(response['Attributes']['message_count'])
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            return None
 
     def get_other_dm_user(self, channel_id: str, user_id: str) -> Optional[str]:
         """Get the other user in a DM channel."""
@@ -355,36 +601,72 @@ class ChannelService(BaseService):
         return None
 
     def mark_channel_read(self, channel_id: str, user_id: str) -> None:
-        """Mark all current messages in a channel as read for a user."""
-        # Get existing member record
-        if not self.is_channel_member(channel_id, user_id):
-            raise ValueError("User is not a member")
-            
-        # Update the member's last_read timestamp while preserving other fields
+        """Mark all current messages in a channel as read for a user.
+        
+        Makes two requests. A consistent GetItem reads the channel's current
+        message_count, which the member update cannot read from another item.
+        The member item is then updated conditionally, which also stands in for
+        the membership check. Alongside last_read it records that count as
+        read_count, so get_channels_for_user can derive unread counts without a
+        COUNT query.
+        """
         response = self.table.get_item(
             Key={
                 'PK': f'CHANNEL#{channel_id}',
-                'SK': f'MEMBER#{user_id}'
-            }
+                'SK': '#METADATA'
+            },
+            ProjectionExpression='message_count',
+            ConsistentRead=True
         )
-        item = response['Item']
-        item['last_read'] = self._now()
+        message_count = response.get('Item', {}).get('message_count')
         
+        update_expression = 'SET last_read = :ts'
+        values = {':ts': self._now()}
+        if message_count is not None:
+            update_expression += ', read_count = :count'
+            values[':count'] = message_count
+            
         try:
-            self.table.put_item(Item=item)
-        except Exception as e:
-            logging.error(f"Error marking channel as read: {str(e)}")
+            self.table.update_item(
+                Key={
+                    'PK': f'CHANNEL#{channel_id}',
+                    'SK': f'MEMBER#{user_id}'
+                },
+                UpdateExpression=update_expression,
+                ConditionExpression='attribute_exists(SK)',
+                ExpressionAttributeValues=values,
+                ReturnValues='NONE'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                raise ValueError("User is not a member")
+            logger.exception("Error marking channel %s as read for user %s", channel_id, user_id)
             raise
             
     def is_channel_member(self, channel_id: str, user_id: str) -> bool:
         """Check if a user is a member of a channel."""
+        cache_key = (self.table.name, channel_id, user_id)
+        with _CACHE_LOCK:
+            if cache_key in _MEMBER_CACHE:
+                return True
+                
         response = self.table.get_item(
             Key={
                 'PK': f'CHANNEL#{channel_id}',
                 'SK': f'MEMBER#{user_id}'
             }
         )
-        return 'Item' in response 
+        if 'Item' not in response:
+            return False
+        with _CACHE_LOCK:
+            _MEMBER_CACHE[cache_key] = True
+        return True
+
+    def _invalidate_channel(self, channel_id: str) -> None:
+        """Drop a channel's cached metadata after it changes."""
+        with _CACHE_LOCK:
+            _CHANNEL_CACHE.pop((self.table.name, channel_id), None)
+
 
     def get_channel_by_name(self, name: str) -> Optional[Channel]:
         """Get a channel by its name.
@@ -395,27 +677,39 @@ class ChannelService(BaseService):
         Returns:
             Channel object if found, None otherwise
         """
-        try:
-            # Try each possible channel type in sequence
-            for channel_type in ['public', 'private', 'dm', 'bot']:
-                
-                response = self.table.query(
-                    IndexName='GSI1',
-                    KeyConditionExpression=Key('GSI1PK').eq(f'TYPE#{channel_type}') & 
-                                         Key('GSI1SK').eq(f'NAME#{name}'),
-                    Limit=1
-                )
+        cache_key = (self.table.name, name)
+        with _CACHE_LOCK:
+            channel_id = _CHANNEL_NAME_CACHE.get(cache_key)
+        if channel_id:
+            channel = self.get_channel_by_id(channel_id)
+            if channel:
+                return channel
+            with _CACHE_LOCK:
+                _CHANNEL_NAME_CACHE.pop(cache_key, None)
                 
-                if response['Items']:
-                    item = response['Items'][0]
-                    channel = self.get_channel_by_id(item['id'])
-                    print(f"  ✓ Found channel {name} with type {channel_type}")
-                    return channel
+        def query_type(channel_type: str) -> List[Dict]:
+            response = self.table.query(
+                IndexName='GSI1',
+                KeyConditionExpression=Key('GSI1PK').eq(f'TYPE#{channel_type}') & 
+                                     Key('GSI1SK').eq(f'NAME#{name}'),
+                Limit=1
+            )
+            return response['Items']
+            
+        try:
+            # Query every possible channel type at once; earlier types win a tie
+            for items in _QUERY_POOL.map(query_type, ['public', 'private', 'dm', 'bot']):
+                if items:
+                    # GSI1 projects the whole metadata item, so no follow-up GetItem
+                    channel_data = self._clean_item(items[0])
+                    with _CACHE_LOCK:
+                        _CHANNEL_NAME_CACHE[cache_key] = channel_data['id']
+                        _CHANNEL_CACHE[(self.table.name, channel_data['id'])] = channel_data
+                    return Channel(**channel_data)
             
-            print(f"  ✗ Could not find channel {name} with any type")
             return None
         except Exception as e:
-            print(f"Error getting channel by name: {e}")
+            logger.exception("Error getting channel by name %s", name)
             return None 
 
     def get_workspace_channels(self, workspace_id: str, user_id: Optional[str] = None, public_only: bool = False) -> List[Channel]:
@@ -435,13 +729,16 @@ class ChannelService(BaseService):
                                  Key('GSI4SK').begins_with('CHANNEL#')
         )
         
-        channels = []
+        # One membership query for the user instead of a probe per channel
+        member_channel_ids = self.get_channel_ids_for_user(user_id) if user_id else set()
+        
+        channels_data = []
         for item in response['Items']:
             channel_data = self._clean_item(item)
             channel_id = channel_data['id']
             # Check if the user is a member of the channel, if user_id is provided
             if user_id:
-                is_member = self.is_channel_member(channel_id, user_id)
+                is_member = channel_id in member_channel_ids
                 
                 
                 if not is_member and channel_data['type'] != 'public':
@@ -449,8 +746,16 @@ class ChannelService(BaseService):
                 channel_data['is_member'] = is_member
             if public_only and channel_data['type'] != 'public':
                 continue
+            channels_data.append(channel_data)
+        
+        # Resolve DM members for all DMs in one batch
+        dm_members = self.get_members_for_channels(
+            [channel_data['id'] for channel_data in channels_data if channel_data['type'] == 'dm']
+        )
+        channels = []
+        for channel_data in channels_data:
             if channel_data['type'] == 'dm':
-                channel_data['members'] = self.get_channel_members(channel_id)
+                channel_data['members'] = dm_members.get(channel_data['id'], [])
             channels.append(Channel(**channel_data))
         return channels
 
@@ -479,6 +784,7 @@ class ChannelService(BaseService):
                 ':channel_sk': f'CHANNEL#{channel_id}'
             }
         )
+        self._invalidate_channel(channel_id)
 
     def find_channels_without_workspace(self) -> List[Channel]:
         """Find all channels that don't have a workspace assigned and assign them to NO_WORKSPACE.
@@ -486,38 +792,59 @@ class ChannelService(BaseService):
         Returns:
             List of channels that were updated with NO_WORKSPACE
         """
-        # Query all channels using GSI1 for public and private channels
-        channels = []
+        # Query all channels using GSI1 for public and private channels, collecting
+        # the ones to fix before writing anything
+        targets = []
         for channel_type in ['public', 'private']:
-            response = self.table.query(
-                IndexName='GSI1',
-                KeyConditionExpression=Key('GSI1PK').eq(f'TYPE#{channel_type}')
-            )
+            query_params = {
+                'IndexName': 'GSI1',
+                'KeyConditionExpression': Key('GSI1PK').eq(f'TYPE#{channel_type}')
+            }
+            while True:
+                response = self.table.query(**query_params)
+                targets.extend(
+                    item for item in response['Items']
+                    if item['SK'] == '#METADATA' and (
+                        'workspace_id' not in item or 
+                        not item.get('workspace_id', '').strip()  # Handle both missing and empty workspace_id
+                    )
+                )
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+                
+        def assign_no_workspace(item: Dict) -> Optional[Channel]:
+            # Update channel with NO_WORKSPACE, unless it was assigned since it was read
+            values = {
+                ':wid': 'NO_WORKSPACE',
+                ':wpk': 'WORKSPACE#NO_WORKSPACE',
+                ':csk': f'CHANNEL#{item["id"]}'
+            }
+            if 'workspace_id' in item:
+                condition = 'workspace_id = :seen'
+                values[':seen'] = item['workspace_id']
+            else:
+                condition = 'attribute_not_exists(workspace_id)'
+            try:
+                self.table.update_item(
+                    Key={
+                        'PK': item['PK'],
+                        'SK': '#METADATA'
+                    },
+                    UpdateExpression='SET workspace_id = :wid, GSI4PK = :wpk, GSI4SK = :csk',
+                    ConditionExpression=condition,
+                    ExpressionAttributeValues=values
+                )
+            except Exception as e:
+                logger.exception("Error updating channel %s", item['id'])
+                return None
+            self._invalidate_channel(item['id'])
+            channel_data = self._clean_item(item)
+            channel_data['workspace_id'] = 'NO_WORKSPACE'
+            return Channel(**channel_data)
             
-            for item in response['Items']:
-                if item['SK'] == '#METADATA' and (
-                    'workspace_id' not in item or 
-                    not item.get('workspace_id', '').strip()  # Handle both missing and empty workspace_id
-                ):
-                    # Update channel with NO_WORKSPACE
-                    try:
-                        self.table.update_item(
-                            Key={
-                                'PK': item['PK'],
-                                'SK': '#METADATA'
-                            },
-                            UpdateExpression='SET workspace_id = :wid, GSI4PK = :wpk, GSI4SK = :csk',
-                            ExpressionAttributeValues={
-                                ':wid': 'NO_WORKSPACE',
-                                ':wpk': 'WORKSPACE#NO_WORKSPACE',
-                                ':csk': f'CHANNEL#{item["id"]}'
-                            }
-                        )
-                        channels.append(Channel(**self._clean_item(item)))
-                    except Exception as e:
-                        logging.error(f"Error updating channel {item['id']}: {str(e)}")
-                        
-        return channels
+        # Updates are independent single-item writes; issue them concurrently
+        return [channel for channel in _QUERY_POOL.map(assign_no_workspace, targets) if channel]
 
     def assign_default_workspace_to_channels(self) -> int:
         """Find all channels without workspace and assign them to NO_WORKSPACE.
@@ -1,15 +1,44 @@
-from typing import Optional, List, Dict, Set
+from typing import Optional, List, Dict, Set, Tuple
 from datetime import datetime, timezone
 import uuid
-import boto3
 from boto3.dynamodb.conditions import Key, Attr
-from ..models.message import Message
+from botocore.exceptions import ClientError
+from ..models.message import Message, EMPTY_LIST
 from ..models.reaction import Reaction
 from .base_service import BaseService
 from .user_service import UserService
 from .channel_service import ChannelService
 import time
-import os
+import base64
+import binascii
+import orjson
+import queue
+import threading
+from concurrent.futures import Future
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_cursor(last_evaluated_key: Dict) -> str:
+    """Turn a query's LastEvaluatedKey into an opaque, URL-safe page cursor."""
+    return base64.urlsafe_b64encode(orjson.dumps(last_evaluated_key)).decode()
+
+
+# A GSI1 query's LastEvaluatedKey carries exactly the table and index keys
+_CURSOR_KEYS = frozenset({'PK', 'SK', 'GSI1PK', 'GSI1SK'})
+
+
+def _decode_cursor(cursor: str) -> Dict:
+    """Inverse of _encode_cursor; raises ValueError for malformed cursors."""
+    try:
+        key = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, orjson.JSONDecodeError, UnicodeEncodeError):
+        raise ValueError("Invalid cursor")
+    if (not isinstance(key, dict) or key.keys() != _CURSOR_KEYS
+            or not all(isinstance(v, str) for v in key.values())):
+        raise ValueError("Invalid cursor")
+    return key
 
 class MessageService(BaseService):
     """Message service for managing chat messages in DynamoDB.
@@ -28,6 +57,8 @@ class MessageService(BaseService):
     - Word Index (for search):
         PK=WORD#{word} SK=MESSAGE#{message_id}            # Word to message mapping
         GSI3PK=CONTENT#{word} GSI3SK=TS#{timestamp}       # For chronological word search
+        Attributes:
+            - messages: List<Map{id, thread_id}>  # Messages containing the word
         
     Access Patterns:
     - Get channel messages: Query GSI1 with CHANNEL#{id} prefix, ordered by timestamp
@@ -35,16 +66,27 @@ class MessageService(BaseService):
     - Get user messages: Query GSI2 with USER#{id} prefix, ordered by timestamp
     - Search messages by word: Query GSI3 with CONTENT#{word} prefix, ordered by timestamp
     """
-    def __init__(self, table_name: str = None):
+    INDEX_BATCH_SIZE = 100
+    INDEX_BATCH_WINDOW = 0.01  # seconds to wait for more entries before flushing
+    INDEX_MAX_ATTEMPTS = 5  # writes per word before a batch's entries are given up on
+
+    def __init__(self, table_name: str = None, index_write_behind: bool = False):
+        """Args:
+            table_name: DynamoDB table name
+            index_write_behind: When True, search-index writes are queued and
+                flushed in batches by a background thread instead of being
+                written inline by create_message. Failed writes are retried
+                with backoff (a retry after an ambiguous timeout can repeat an
+                entry); entries still queued when the process exits are lost,
+                so those messages are missing from search.
+        """
         super().__init__(table_name)
+        self._index_queue = None
+        if index_write_behind:
+            self._index_queue = queue.Queue()
+            threading.Thread(target=self._index_writer, daemon=True).start()
         self.user_service = UserService(table_name)
-        self.channel_service = ChannelService(table_name)
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION')
-        )
+        self.channel_service = ChannelService(table_name, user_service=self.user_service)
         
     def create_message(self, channel_id: str, user_id: str, content: str, thread_id: str = None, attachments: List[str] = None, created_at: str = None) -> Message:
         """Create a new message.
@@ -106,24 +148,18 @@ class MessageService(BaseService):
         try:
             # Write to DynamoDB
             self.table.put_item(Item=item)
+            message_number = self.channel_service.increment_message_count(channel_id)
             
             # Index words for search
             if content:
+                entry = {'id': message_id, 'thread_id': thread_id} if thread_id else {'id': message_id}
                 words = set(content.lower().split())
-                for word in words:
-                    self.table.update_item(
-                        Key={
-                            'PK': f'WORD#{word}',
-                            'SK': '#METADATA'
-                        },
-                        UpdateExpression="SET messages = list_append(if_not_exists(messages, :empty_list), :new_message), GSI3PK = :gsi3pk, GSI3SK = :gsi3sk",
-                        ExpressionAttributeValues={
-                            ':new_message': [f'{message_id}#{thread_id}' if thread_id else message_id],
-                            ':empty_list': [],
-                            ':gsi3pk': f'CONTENT#{word}',
-                            ':gsi3sk': '#METADATA'
-                        }
-                    )
+                if self._index_queue is not None:
+                    future = self._queue_index_entry(words, entry)
+                    future.add_done_callback(lambda f: self._record_index_result(message_id, f))
+                else:
+                    for word in words:
+                        self._append_word_entries(word, [entry])
                 
             message = Message(
                 id=message_id,
@@ -135,7 +171,8 @@ class MessageService(BaseService):
                 attachments=attachments,
                 reactions={},
                 is_edited=False,
-                version=1
+                version=1,
+                channel_message_number=message_number
             )
             
             # Attach user data
@@ -144,10 +181,92 @@ class MessageService(BaseService):
             return message
             
         except Exception as e:
-            print(f"Error creating message: {type(e).__name__} - {str(e)}")
-            print("Failed item:", item)
+            logger.error("Error creating message: %s - %s", type(e).__name__, e)
+            logger.debug("Failed item: %s", item)
             raise
 
+    def _append_word_entries(self, word: str, entries: List[Dict]) -> None:
+        """Append message entries to a word's search index item."""
+        self.table.update_item(
+            Key={
+                'PK': f'WORD#{word}',
+                'SK': '#METADATA'
+            },
+            UpdateExpression="SET messages = list_append(if_not_exists(messages, :empty_list), :new_message), GSI3PK = :gsi3pk, GSI3SK = :gsi3sk",
+            ExpressionAttributeValues={
+                ':new_message': entries,
+                ':empty_list': [],
+                ':gsi3pk': f'CONTENT#{word}',
+                ':gsi3sk': '#METADATA'
+            }
+        )
+
+    def _queue_index_entry(self, words: Set[str], entry: Dict) -> Future:
+        """Queue a message's search-index entry for the writer thread.
+        
+        The returned future resolves once every word is written, or carries the
+        last error if some word could not be written after INDEX_MAX_ATTEMPTS.
+        """
+        future = Future()
+        self._index_queue.put((words, entry, future))
+        return future
+
+    def _record_index_result(self, message_id: str, future: Future) -> None:
+        """Log a message whose search-index entry could not be written."""
+        if future.exception() is not None:
+            logger.error("Message %s is missing from search: %s", message_id, future.exception())
+
+    def _append_word_entries_with_retry(self, word: str, entries: List[Dict]) -> None:
+        """_append_word_entries with exponential backoff, raising the last error."""
+        for attempt in range(self.INDEX_MAX_ATTEMPTS):
+            try:
+                return self._append_word_entries(word, entries)
+            except Exception as e:
+                if attempt == self.INDEX_MAX_ATTEMPTS - 1:
+                    raise
+                logger.warning("Retrying index write for word %s: %s", word, e)
+                time.sleep(min(0.05 * 2 ** attempt, 1.0))
+
+    def _index_writer(self) -> None:
+        """Drain queued index entries and write one update per word per batch."""
+        while True:
+            batch = [self._index_queue.get()]
+            deadline = time.monotonic() + self.INDEX_BATCH_WINDOW
+            while len(batch) < self.INDEX_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._index_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            entries_by_word: Dict[str, List[Dict]] = {}
+            for words, entry, _ in batch:
+                for word in words:
+                    entries_by_word.setdefault(word, []).append(entry)
+
+            failed_words: Dict[str, Exception] = {}
+            for word, entries in entries_by_word.items():
+                try:
+                    self._append_word_entries_with_retry(word, entries)
+                except Exception as e:
+                    logger.error("Error indexing word %s: %s", word, e)
+                    failed_words[word] = e
+
+            for words, _, future in batch:
+                errors = [failed_words[word] for word in words if word in failed_words]
+                if errors:
+                    future.set_exception(errors[-1])
+                else:
+                    future.set_result(None)
+                self._index_queue.task_done()
+
+    def flush_index(self) -> None:
+        """Block until all queued search-index writes have been applied."""
+        if self._index_queue is not None:
+            self._index_queue.join()
+
     def get_message(self, message_id: str, thread_id: Optional[str] = None) -> Optional[Message]:
         """Get a message by ID
         
@@ -159,36 +278,19 @@ class MessageService(BaseService):
             Message if found, None otherwise
         """
         # For thread replies, use thread_id as PK and message_id as SK
-        if thread_id:
-            response = self.table.get_item(
-                Key={
-                    'PK': f'MSG#{thread_id}',
-                    'SK': f'REPLY#{message_id}'
-                }
-            )
-        else:
-            response = self.table.get_item(
-                Key={
-                    'PK': f'MSG#{message_id}',
-                    'SK': f'MSG#{message_id}'
-                }
-            )
+        response = self.table.get_item(Key=self._message_key(message_id, thread_id))
         
         if 'Item' not in response:
             return None
             
-        item = self._clean_item(response['Item'])
-        item['reactions'] = response['Item'].get('reactions', {})
-        message = Message(**item)
-        
-        # Add user data
-        user = self.user_service.get_user_by_id(message.user_id)
-        if user:
-            message.user = user
-            
-        return message
+        item = response['Item']
+        return self._message_from_item(item, self.user_service.get_user_by_id(item['user_id']))
+
+    def _message_from_item(self, item: Dict, user=None) -> Message:
+        """Build a Message straight from a DynamoDB item without copying it first."""
+        return Message._init_from_row(item, user)
 
-    def get_messages(self, channel_id: str, limit: int = 10000, reverse: bool = False, start_time: Optional[str] = None, end_time: Optional[str] = None) -> List[Message]:
+    def get_messages(self, channel_id: str, limit: int = 10000, reverse: bool = False, start_time: Optional[str] = None, end_time: Optional[str] = None, before: Optional[str] = None) -> List[Message]:
         """Get messages from a channel with optional time range filtering
         
         Args:
@@ -197,10 +299,109 @@ class MessageService(BaseService):
             reverse: If True, returns messages in reverse chronological order (newest first)
             start_time: Optional start timestamp to filter messages
             end_time: Optional end timestamp to filter messages
+            before: Optional timestamp cursor; returns the `limit` messages just
+                before it (takes precedence over end_time)
             
         Returns:
             List of messages in chronological order (or reverse if reverse=True)
         """
+        items = self._query_channel_items(channel_id, limit, reverse, start_time, end_time, before)
+                
+        # Get all unique user IDs first
+        user_ids = set(item['user_id'] for item in items)
+        users = {user.id: user for user in self.user_service._batch_get_users(user_ids)}
+        
+        # Process messages
+        messages = [self._message_from_item(item, users.get(item['user_id'])) for item in items]
+        
+        # Add replies to messages
+        messages = self._add_replies_to_messages(messages)
+        
+        return messages
+
+    def get_messages_raw(self, channel_id: str, limit: int = 10000, reverse: bool = False, start_time: Optional[str] = None, end_time: Optional[str] = None, before: Optional[str] = None) -> List[Dict]:
+        """Get messages from a channel already shaped for the API response.
+        
+        Builds the same dicts as ``Message.to_dict`` straight from the DynamoDB
+        items, skipping the intermediate Message objects for routes that only
+        serialize the result. Arguments match ``get_messages``.
+        """
+        items = self._query_channel_items(channel_id, limit, reverse, start_time, end_time, before)
+        return self._raw_messages_from_items(items)
+
+    def get_messages_page(self, channel_id: str, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Get one page of channel messages, walking back from the newest.
+        
+        Args:
+            channel_id: The channel to get messages from
+            limit: Maximum number of messages in the page
+            cursor: Opaque cursor returned with the previous page, or None for the latest page
+            
+        Returns:
+            Tuple of (API-shaped messages in chronological order, cursor for the
+            next older page or None when history is exhausted)
+        """
+        channel = self.channel_service.get_channel_by_id(channel_id)
+        if not channel:
+            raise ValueError("Channel not found")
+        
+        query_params = {
+            'IndexName': 'GSI1',
+            'KeyConditionExpression': Key('GSI1PK').eq(f'CHANNEL#{channel_id}'),
+            'ScanIndexForward': False,
+            'Limit': limit
+        }
+        if cursor:
+            start_key = _decode_cursor(cursor)
+            if start_key.get('GSI1PK') != f'CHANNEL#{channel_id}':
+                raise ValueError("Invalid cursor")
+            query_params['ExclusiveStartKey'] = start_key
+        
+        response = self.table.query(**query_params)
+        items = response['Items']
+        items.reverse()
+        
+        last_key = response.get('LastEvaluatedKey')
+        return self._raw_messages_from_items(items), _encode_cursor(last_key) if last_key else None
+
+    def _raw_messages_from_items(self, items: List[Dict]) -> List[Dict]:
+        """Shape raw message items like ``Message.to_dict``, attaching users and in-page replies."""
+        user_ids = set(item['user_id'] for item in items)
+        users = {user.id: user.to_dict() for user in self.user_service._batch_get_users(user_ids)}
+        
+        messages = []
+        by_id = {}
+        for item in items:
+            data = {
+                'id': item['id'],
+                'content': item['content'],
+                'userId': item['user_id'],
+                'channelId': item['channel_id'],
+                'threadId': item.get('thread_id'),
+                'createdAt': item['created_at'],
+                'attachments': item.get('attachments', EMPTY_LIST),
+                'user': users.get(item['user_id']),
+                'reactions': item.get('reactions', {}),
+                'editedAt': item.get('edited_at'),
+                'isEdited': item.get('is_edited', False)
+            }
+            if item.get('edit_history'):
+                data['editHistory'] = item['edit_history']
+            messages.append(data)
+            by_id[data['id']] = data
+        
+        # Add replies to parent messages
+        for data in messages:
+            parent = by_id.get(data['threadId']) if data['threadId'] else None
+            if parent:
+                replies = parent.setdefault('replies', [])
+                replies.append(data['id'])
+                parent['replyCount'] = len(replies)
+        
+        return messages
+
+    def _query_channel_items(self, channel_id: str, limit: int, reverse: bool, start_time: Optional[str], end_time: Optional[str], before: Optional[str] = None) -> List[Dict]:
+        """Query raw message items for a channel, reading at most limit items from DynamoDB."""
         # Verify channel exists
         channel = self.channel_service.get_channel_by_id(channel_id)
         if not channel:
@@ -213,7 +414,14 @@ class MessageService(BaseService):
         }
         
         # Add time range filtering
-        if start_time and end_time:
+        if before:
+            # Keyset page: walk backwards from the cursor so only one page is read
+            query_params['ScanIndexForward'] = False
+            if start_time:
+                query_params['KeyConditionExpression'] &= Key('GSI1SK').between(f'TS#{start_time}', f'TS#{before}')
+            else:
+                query_params['KeyConditionExpression'] &= Key('GSI1SK').lt(f'TS#{before}')
+        elif start_time and end_time:
             query_params['KeyConditionExpression'] &= Key('GSI1SK').between(f'TS#{start_time}', f'TS#{end_time}')
         elif start_time:
             query_params['KeyConditionExpression'] &= Key('GSI1SK').gte(f'TS#{start_time}')
@@ -227,41 +435,22 @@ class MessageService(BaseService):
         while True:
             if last_evaluated_key:
                 query_params['ExclusiveStartKey'] = last_evaluated_key
+            query_params['Limit'] = max(limit - len(all_items), 1)
                 
             response = self.table.query(**query_params)
-            all_items.extend(response['Items'])
+            if before:
+                all_items.extend(item for item in response['Items'] if item['created_at'] != before)
+            else:
+                all_items.extend(response['Items'])
             
             last_evaluated_key = response.get('LastEvaluatedKey')
             if not last_evaluated_key or len(all_items) >= limit:
                 break
                 
-        # Get all unique user IDs first
-        user_ids = set(item['user_id'] for item in all_items)
-        users = {user.id: user for user in self.user_service._batch_get_users(user_ids)}
-        
-        # Process messages
-        messages = []
-        for item in all_items[:limit]:  # Apply limit here
-            cleaned = self._clean_item(item)
-            cleaned['reactions'] = item.get('reactions', {})
-
-            message = Message(**cleaned)
-            
-            # Add user data
-            if message.user_id in users:
-                message.user = users[message.user_id]
-                
-            messages.append(message)
-            
-             
-    
-        # Set thread_id to message_id for all messages
-        
-        
-        # Add replies to messages
-        messages = self._add_replies_to_messages(messages)
-        
-        return messages
+        all_items = all_items[:limit]
+        if before and not reverse:
+            all_items.reverse()
+        return all_items
     
     def _add_replies_to_messages(self, messages: List[Message]) -> List[Message]:
         """Add replies to messages"""
@@ -272,8 +461,7 @@ class MessageService(BaseService):
             if message.thread_id:
                 parent_message = message_map.get(message.thread_id)
                 if parent_message:
-                    parent_message.replies.append(message.id)
-                    parent_message.reply_count = len(parent_message.replies)
+                    parent_message.add_reply(message.id)
                     #print(f"Added reply to parent message {message.thread_id}: {message.id}")
         return messages
 
@@ -286,78 +474,77 @@ class MessageService(BaseService):
         Returns:
             List of messages in chronological order
         """
-        # Query messages
-        response = self.table.query(
-            KeyConditionExpression=Key('PK').eq(f'MSG#{thread_id}') & Key('SK').begins_with('REPLY#'),
-            ScanIndexForward=True  # Return in chronological order
-        )
+        # Query messages; replies share the parent's partition, so long threads
+        # page past the 1MB query limit instead of being cut off
+        query_params = {
+            'KeyConditionExpression': Key('PK').eq(f'MSG#{thread_id}') & Key('SK').begins_with('REPLY#')
+        }
+        items = []
+        while True:
+            response = self.table.query(**query_params)
+            items.extend(response['Items'])
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
         
         # Get all unique user IDs first
-        user_ids = set(item['user_id'] for item in response['Items'])
+        user_ids = set(item['user_id'] for item in items)
         users = {user.id: user for user in self.user_service._batch_get_users(user_ids)}
         
         # Process messages and sort by timestamp
-        messages = []
-        for item in response['Items']:
-            cleaned = self._clean_item(item)
-            cleaned['reactions'] = item.get('reactions', {})
-            message = Message(**cleaned)
-            
-            # Add user data
-            if message.user_id in users:
-                message.user = users[message.user_id]
-                
-            messages.append(message)
+        messages = [self._message_from_item(item, users.get(item['user_id'])) for item in items]
             
         # Sort by timestamp to ensure chronological order
         messages.sort(key=lambda m: m.created_at)
             
         return messages
 
+    def _message_key(self, message_id: str, thread_id: Optional[str] = None) -> Dict:
+        """Build the primary key of a message, or of a reply when thread_id is given."""
+        if thread_id:
+            return {'PK': f'MSG#{thread_id}', 'SK': f'REPLY#{message_id}'}
+        return {'PK': f'MSG#{message_id}', 'SK': f'MSG#{message_id}'}
+
+    def get_message_reactions(self, message_id: str, thread_id: Optional[str] = None) -> Dict[str, List[str]]:
+        """Get the reactions map of a message.
+        
+        Reactions live on the message item itself, so this reads only that
+        attribute instead of loading the full message and its author.
+        
+        Raises:
+            ValueError: If the message does not exist
+        """
+        response = self.table.get_item(
+            Key=self._message_key(message_id, thread_id),
+            ProjectionExpression='reactions, id'
+        )
+        if 'Item' not in response:
+            raise ValueError("Message not found")
+        return response['Item'].get('reactions') or {}
+
     def add_reaction(self, message_id: str, user_id: str, emoji: str, thread_id: str = None) -> Reaction:
         """Add a reaction by updating the reactions map in the message item"""
-        print(f"\n=== Adding reaction to message {message_id} ===")
-        print(f"User: {user_id}")
-        print(f"Emoji: {emoji}")
+        logger.debug("Adding reaction %s from user %s to message %s", emoji, user_id, message_id)
         timestamp = self._now()
         
-        # First get the message
-        message = self.get_message(message_id, thread_id)
-        if not message:
-            raise ValueError("Message not found")
-            
-        print(f"Found message. Current reactions: {message.reactions}")
-            
         # Get existing reactions map from the message item
-        reactions = message.reactions if message.reactions else {}
-        print(f"Initial reactions map: {reactions}")
+        reactions = self.get_message_reactions(message_id, thread_id)
             
         # Add the new reaction
         if emoji not in reactions:
-            print(f"Creating new reactions list for emoji {emoji}")
             reactions[emoji] = []
         if user_id not in reactions[emoji]:
-            print(f"Adding user {user_id} to reactions for {emoji}")
             reactions[emoji].append(user_id)
-        else:
-            print(f"User {user_id} already reacted with {emoji}")
-            
-        print(f"Final reactions map to save: {reactions}")
             
         # Update reactions
         self.table.update_item(
-            Key={
-                'PK': f'MSG#{message_id}',
-                'SK': f'MSG#{message_id}'
-            },
+            Key=self._message_key(message_id, thread_id),
             UpdateExpression='SET reactions = :reactions',
             ExpressionAttributeValues={
                 ':reactions': reactions
             }
         )
         
-        print("Saved reactions to DynamoDB")
-        
         return Reaction(
             message_id=message_id,
             user_id=user_id,
@@ -367,93 +554,79 @@ class MessageService(BaseService):
 
     def remove_reaction(self, message_id: str, user_id: str, emoji: str, thread_id: str = None) -> None:
         """Remove a reaction from a message"""
-        print(f"\n=== Removing reaction from message {message_id} ===")
-        print(f"User: {user_id}")
-        print(f"Emoji: {emoji}")
+        logger.debug("Removing reaction %s from user %s on message %s", emoji, user_id, message_id)
         
-        # First get the message
-        message = self.get_message(message_id, thread_id)
-        if not message:
-            raise ValueError("Message not found")
-            
-        print(f"Found message. Current reactions: {message.reactions}")
-            
         # Get existing reactions map from the message item
-        reactions = message.reactions if message.reactions else {}
-        print(f"Initial reactions map: {reactions}")
+        reactions = self.get_message_reactions(message_id, thread_id)
             
         # Remove the reaction
         if emoji in reactions and user_id in reactions[emoji]:
-            print(f"Removing user {user_id} from reactions for {emoji}")
             reactions[emoji].remove(user_id)
             
             # Remove the emoji key if no users are left
             if not reactions[emoji]:
-                print(f"No users left for {emoji}, removing emoji key")
                 del reactions[emoji]
         else:
-            print(f"User {user_id} has not reacted with {emoji}")
+            logger.debug("User %s has not reacted with %s", user_id, emoji)
             return
             
-        print(f"Final reactions map to save: {reactions}")
-            
         # Update reactions
         self.table.update_item(
-            Key={
-                'PK': f'MSG#{message_id}',
-                'SK': f'MSG#{message_id}'
-            },
+            Key=self._message_key(message_id, thread_id),
             UpdateExpression='SET reactions = :reactions',
             ExpressionAttributeValues={
                 ':reactions': reactions
             }
         )
-        
-        print("Saved reactions to DynamoDB")
 
     def update_message(self, message_id: str, content: str) -> Message:
         """Update a message's content and maintain edit history"""
         timestamp = self._now()
+        key = self._message_key(message_id)
         
-        # First get the message
-        message = self.get_message(message_id)
-        if not message:
+        # First get what the version entry and channel check need
+        response = self.table.get_item(
+            Key=key,
+            ProjectionExpression='content, created_at, edited_at, channel_id'
+        )
+        if 'Item' not in response:
             raise ValueError("Message not found")
+        current = response['Item']
             
         # Verify channel still exists
-        channel = self.channel_service.get_channel_by_id(message.channel_id)
+        channel = self.channel_service.get_channel_by_id(current['channel_id'])
         if not channel:
             raise ValueError("Channel not found")
             
         # Create a version entry with the current content and timestamp
         version_entry = {
-            'content': message.content,  # Current content becomes old version
-            'edited_at': message.edited_at if hasattr(message, 'edited_at') else message.created_at
+            'content': current['content'],  # Current content becomes old version
+            'edited_at': current.get('edited_at', current['created_at'])
         }
             
-        # Update message
-        self.table.update_item(
-            Key={
-                'PK': f'MSG#{message_id}',
-                'SK': f'MSG#{message_id}'
-            },
-            UpdateExpression='SET content = :content, edited_at = :edited_at, is_edited = :is_edited, edit_history = list_append(if_not_exists(edit_history, :empty_list), :version)',
-            ExpressionAttributeValues={
-                ':content': content,
-                ':edited_at': timestamp,
-                ':is_edited': True,
-                ':version': [version_entry],
-                ':empty_list': []
-            }
-        )
+        # Update message; the write returns the updated item, so it is not read back
+        try:
+            response = self.table.update_item(
+                Key=key,
+                UpdateExpression='SET content = :content, edited_at = :edited_at, is_edited = :is_edited, edit_history = list_append(if_not_exists(edit_history, :empty_list), :version)',
+                ConditionExpression='attribute_exists(PK)',
+                ExpressionAttributeValues={
+                    ':content': content,
+                    ':edited_at': timestamp,
+                    ':is_edited': True,
+                    ':version': [version_entry],
+                    ':empty_list': []
+                },
+                ReturnValues='ALL_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                raise ValueError("Message not found")
+            raise
             
-        # Get updated message and attach user data
-        updated_message = self.get_message(message_id)
-        if updated_message:
-            user = self.user_service.get_user_by_id(updated_message.user_id)
-            if user:
-                updated_message.user = user
-        return updated_message 
+        # Attach user data
+        item = response['Attributes']
+        return self._message_from_item(item, self.user_service.get_user_by_id(item['user_id']))
 
     def get_user_messages(self, user_id: str, before: str = None, limit: int = 50) -> List[Message]:
         """Get messages created by a user.
@@ -493,17 +666,6 @@ class MessageService(BaseService):
         response = self.table.query(**query_params)
 
         # Process messages
-        messages = []
-        for item in response['Items']:
-            cleaned = self._clean_item(item)
-            cleaned['reactions'] = item.get('reactions', {})
-            cleaned['attachments'] = item.get('attachments', [])
-            cleaned['edit_history'] = item.get('edit_history', [])
-            cleaned['is_edited'] = item.get('is_edited', False)
-            cleaned['edited_at'] = item.get('edited_at')
-            
-            message = Message(**cleaned)
-            message.user = user
-            messages.append(message)
+        messages = [self._message_from_item(item, user) for item in response['Items']]
         
         return messages 
\ No newline at end of file
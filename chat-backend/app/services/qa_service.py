@@ -9,8 +9,13 @@ from app.models.user import User
 import os
 from datetime import datetime
 import tiktoken
+import hashlib
+import logging
+from functools import lru_cache
+import threading
+from cachetools import TTLCache
 
-from .vector_service import VectorService
+from .vector_service import VectorService, get_vector_service
 from .user_service import UserService
 from .user_profile_service import UserProfileService
 from .channel_service import ChannelService
@@ -18,6 +23,9 @@ from .message_service import MessageService
 from .workspace_service import WorkspaceService
 from ..models.message import Message
 from ..models.user_profile import UserProfile
+
+logger = logging.getLogger(__name__)
+
 # Constants
 TOKEN_LIMIT = 8192
 BUFFER_SIZE = 250
@@ -25,14 +33,44 @@ MESSAGE_BATCH_SIZE = 5
 PREVIOUS_MESSAGES_PREAMBLE = "The following is your previous answer, based on the previous relevant messages."
 NEW_MESSAGES_PREAMBLE = "The following are the current messages. Please integrate the below set of messages with the previous response to provide a cohesive response. Avoid using words like \"continue\" and \"still\" that indicate you are comparing the previous response to the current messages. It should not be obvious to the end user that multiple prompts were used to construct the response."
 
+# Exact-match vector-index answers for the /qa routes (get_all answers read live
+# messages and are not cached). Entries expire after ten minutes and
+# the whole cache is cleared whenever content is re-indexed.
+_ANSWER_CACHE = TTLCache(maxsize=1024, ttl=600)
+_ANSWER_CACHE_LOCK = threading.Lock()
+
+
+def answer_cache_key(scope: str, scope_id: str, question: str) -> Tuple:
+    """Key an answer by what was asked about and the whitespace/case-normalized question."""
+    normalized = ' '.join(question.lower().split())
+    return (scope, scope_id, hashlib.sha1(normalized.encode()).hexdigest())
+
+
+def get_cached_answer(key: Tuple) -> Optional[Dict]:
+    with _ANSWER_CACHE_LOCK:
+        return _ANSWER_CACHE.get(key)
+
+
+def cache_answer(key: Tuple, response: Dict) -> None:
+    with _ANSWER_CACHE_LOCK:
+        _ANSWER_CACHE[key] = response
+
+
+def clear_answer_cache() -> None:
+    """Forget all cached answers, e.g. after the vector store changes."""
+    with _ANSWER_CACHE_LOCK:
+        _ANSWER_CACHE.clear()
+
+
 class QAService:
     def __init__(self, table_name: str = None):
         """Initialize QA service with connections to other services"""
-        self.vector_service = VectorService(table_name)
+        # The default table shares the process-wide VectorService and its OpenAI/Pinecone clients
+        self.vector_service = get_vector_service() if table_name is None else VectorService(table_name)
         self.user_service = UserService(table_name)
-        self.channel_service = ChannelService(table_name)
-        self.message_service = MessageService()
         self.workspace_service = WorkspaceService(table_name)
+        self.channel_service = ChannelService(table_name, user_service=self.user_service, workspace_service=self.workspace_service)
+        self.message_service = MessageService()
         self.user_profile_service = UserProfileService(table_name)
         # Initialize LangChain components
         self.embeddings = OpenAIEmbeddings(model="text-embedding-3-large")
@@ -93,9 +131,9 @@ class QAService:
             }
         )
         
-        print(f"\nSearching with query for topic: {question}")
+        logger.debug("Searching with query for topic: %s", question)
         results = await filtered_retriever.ainvoke(search_query)
-        print(f"Found {len(results)} semantically relevant messages")
+        logger.debug("Found %s semantically relevant messages", len(results))
         return results
 
     async def _get_user_profile(self, user_id: str) -> Optional[dict]:
@@ -156,7 +194,7 @@ class QAService:
         """Build context parts from user profiles and message documents."""
         context_parts = []
         user_initials = {}
-        print("Formatting context parts...")
+        logger.debug("Formatting context parts...")
         if user_profiles:
             context_parts.append("Team Members:")
             for profile in user_profiles.values():
@@ -167,7 +205,7 @@ class QAService:
                 lines[0] = f"Name: {name}. Initials (for reference in chat): {initials}"
                 context_parts.append(f"- {chr(10).join(lines)}")
         channel_messages = {}
-        print("Building channel messages...")
+        logger.debug("Building channel messages...")
         for message in message_docs:
             channel_id = message.channel_id
             channel_name = channel_id_to_name.get(channel_id, 'unknown-channel')
@@ -236,7 +274,7 @@ class QAService:
                     updated_context = template.format(question=question, recent_messages=recent_messages, context="\n\n".join(context_parts), asker=asker_name)
                     total_tokens = self.count_tokens(updated_context)
                     if total_tokens > max_tokens:
-                        print(f"\nReached token limit at {message_count} messages")
+                        logger.debug("Reached token limit at %s messages", message_count)
                         context_parts = context_parts[:-MESSAGE_BATCH_SIZE] # Remove the last batch of messages since it is over
                         message_index = max(0, message_index - MESSAGE_BATCH_SIZE) # Decrement message_index by MESSAGE_BATCH_SIZE to use these in the next call
                         return context_parts, channel_index, message_index + 1
@@ -244,7 +282,7 @@ class QAService:
             start_message = 0  # Reset start_message for subsequent channels
             if total_tokens > max_tokens:
                 break
-        print(f"✓ Included {message_count} messages (approx. {total_tokens} tokens)")
+        logger.debug("Included %s messages (approx. %s tokens)", message_count, total_tokens)
         return context_parts, None, None
 
     def _remove_duplicate_messages(self, message_docs: List[Message]) -> list:
@@ -261,7 +299,7 @@ class QAService:
                 if content_hash not in seen_message_ids:
                     seen_message_ids.add(content_hash)
                     unique_messages.append(message)
-        print(f"✓ Removed {len(message_docs) - len(unique_messages)} duplicate messages")
+        logger.debug("Removed %s duplicate messages", len(message_docs) - len(unique_messages))
         return unique_messages
 
     def _convert_to_message(self, doc: Document ) -> Message:
@@ -277,19 +315,19 @@ class QAService:
 
     async def _get_messages_from_vector_db(self, question: str, message_filter: dict, workspace_name: str) -> List[Message]:
         """Retrieve messages using the vector DB with semantic search and convert them to Message objects."""
-        print(f"\nFetching messages with filter: {message_filter}")
+        logger.debug("Fetching messages with filter: %s", message_filter)
         message_docs = await self._get_filtered_messages(question, message_filter, workspace_name)
-        print(f"✓ Found {len(message_docs)} relevant messages")
+        logger.debug("Found %s relevant messages", len(message_docs))
         return [self._convert_to_message(doc) for doc in message_docs]
 
     async def _get_messages_from_ddb(self, channel_ids: List[str]) -> List:
         """Retrieve messages from DDB for given channel IDs."""
         message_docs = []
         for channel_id in channel_ids:
-            print(f"Getting messages for channel {channel_id}")
+            logger.debug("Getting messages for channel %s", channel_id)
             messages = self.message_service.get_messages(channel_id)
             message_docs.extend(messages)
-        print(f"✓ Retrieved {len(message_docs)} messages from DDB")
+        logger.debug("Retrieved %s messages from DDB", len(message_docs))
         return message_docs
 
     async def _get_qa_response(
@@ -324,7 +362,7 @@ class QAService:
         message_docs = self._remove_duplicate_messages(message_docs)
         message_user_ids = set(message.user_id for message in message_docs if message.user_id)
         user_ids = message_user_ids | (additional_users or set())
-        print(f"\nFound {len(user_ids)} unique users")
+        logger.debug("Found %s unique users", len(user_ids))
         user_profiles = await self.fetch_user_profiles(user_ids) if include_user_profiles else {}
 
         context_parts_before_messages, sorted_channels, user_initials = await self.build_context_parts(user_profiles, message_docs, channel_id_to_name)
@@ -333,34 +371,39 @@ class QAService:
         start_channel = 0
         start_message = 0
         while True:
-            print(f"Top of while loop, len of responses: {len(responses)}")
+            logger.debug("Top of while loop, len of responses: %s", len(responses))
             if(len(responses) > 0):               
                 context_parts_before_messages.append(f"{PREVIOUS_MESSAGES_PREAMBLE}{responses[-1]}")
                 context_parts_before_messages.append(f"{NEW_MESSAGES_PREAMBLE}")
             context_parts, start_channel, start_message = await self._add_message_channels_to_context(context_parts_before_messages, sorted_channels, user_initials, template, question, recent_messages, start_channel, start_message, asker)
-            print("After add message channels to context")
+            logger.debug("After add message channels to context")
             context = "\n\n".join(context_parts)
-            print("About to format with recent messages: ", recent_messages)
+            logger.debug("About to format with recent messages: %s", recent_messages)
             asker_name = asker.name if asker else "Unknown User"
             prompt = template.format(question=question, context=context, recent_messages=recent_messages, asker=asker_name)
-            print(f"\n\n=== FULL PROMPT TOKENS: {self.count_tokens(prompt)}")
-            os.makedirs("./temp", exist_ok=True)
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            filename = f"./temp/qa_prompt_{timestamp}.txt"
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                # Tokenizing the prompt is not free; only do it when it will be logged
+                logger.debug("FULL PROMPT TOKENS: %s", self.count_tokens(prompt))
                 
-            print("\nGetting answer from LLM...")
+            logger.debug("Getting answer from LLM...")
             response = await self.llm.ainvoke(prompt)
-            print("✓ Got response")
-            with open(filename, "a", encoding="utf-8") as f:
-                f.write("=== QUESTION ===\n")
-                f.write(question)
-                f.write("\n\n=== FULL PROMPT ===\n")
-                f.write(prompt)
-                f.write("\n\n=== RESPONSE ===\n")
-                f.write(response.content)
+            logger.debug("Got response")
+            if debug:
+                # Prompt dumps are a debugging aid, not something to write on every request
+                os.makedirs("./temp", exist_ok=True)
+                timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+                filename = f"./temp/qa_prompt_{timestamp}.txt"
+                with open(filename, "a", encoding="utf-8") as f:
+                    f.write("=== QUESTION ===\n")
+                    f.write(question)
+                    f.write("\n\n=== FULL PROMPT ===\n")
+                    f.write(prompt)
+                    f.write("\n\n=== RESPONSE ===\n")
+                    f.write(response.content)
+                logger.debug("Wrote prompt and context to %s", filename)
             responses.append(response.content)
             context_parts = ["Previous Response:", response.content] + context_parts
-            print(f"\nWrote prompt and context to {filename}")
             if start_channel is None:
                 break
         return {
@@ -383,19 +426,17 @@ class QAService:
     async def ask_about_workspace(self, workspace_id: str, question: str, get_all: bool = False, recent_messages: str = "", asker: User = None) -> Dict:
         """Answer questions about a workspace using context from its channels and users"""
         # Get all channels in workspace
-        print(f"\n=== Starting workspace QA for '{workspace_id}' ===")
+        logger.debug("Starting workspace QA for '%s'", workspace_id)
         channels = self.channel_service.get_workspace_channels(workspace_id)
         if not channels:
             raise ValueError(f"No channels found in workspace '{workspace_id}'")
-        print(f"✓ Found {len(channels)} channels")
+        logger.debug("Found %s channels", len(channels))
         
-        # Get all channel members
-        workspace_users = set()
-        for channel in channels:
-            members = self.channel_service.get_channel_members(channel.id)
-            workspace_users.update(member['id'] for member in members)
+        # Only member IDs are needed, so skip resolving user records
+        member_ids = self.channel_service.get_member_ids_for_channels([c.id for c in channels])
+        workspace_users = {user_id for ids in member_ids.values() for user_id in ids}
         
-        print(f"Workspace users: {workspace_users}")
+        logger.debug("Workspace users: %s", workspace_users)
         return await self._get_qa_response(
             question=question,
             message_filter={
@@ -443,16 +484,16 @@ class QAService:
         YOU MUST also response in a way that reflects a natural style of communication typical in a direct message in a chat app 
         (eg, don't say "Hi" unless the user says it first).
         """
-        print(f"Prompt FOR PERSONA: {prompt}")
+        logger.debug("Prompt FOR PERSONA: %s", prompt)
         response = await self.llm.ainvoke(prompt)
         message = response.content
-        print(f"Answer from persona: {message}")
+        logger.debug("Answer from persona: %s", message)
         stored_message = self.message_service.create_message(
             content=message,
             channel_id=channel_id,
             user_id=persona_user.id
         )
-        print(f"Stored message: {stored_message}")
+        logger.debug("Stored message: %s", stored_message)
         return stored_message
         
         
@@ -460,7 +501,7 @@ class QAService:
         """Answer a message from the bot"""
         recent_messages = await self._get_recent_messages(channel_id)
         classification = await self._classify_query(content, recent_messages)
-        print(f"Classification: {classification}")
+        logger.debug("Classification: %s", classification)
         get_all = classification.get('type') == 'comprehensive'
 
         response = await self.ask_about_workspace(
@@ -471,14 +512,14 @@ class QAService:
             asker=asker
         )
         message = response.get("answer")
-        print(f"Bot message: {message}")
+        logger.debug("Bot message: %s", message)
         bot_user = self.user_service.get_bot_user("Bot")
         stored_message = self.message_service.create_message(
             content=message,
             channel_id=channel_id,
             user_id=bot_user.id
         )
-        print(f"Stored message: {stored_message}")
+        logger.debug("Stored message: %s", stored_message)
         return stored_message
     
 
@@ -504,10 +545,10 @@ class QAService:
         LAST MESSAGE:
         {question}
         """
-        print(f"Question for snippets: {question}")
+        logger.debug("Question for snippets: %s", question)
         response = await self.llm.ainvoke(question)
         vector_db_question = response.content
-        print(f"Vector DB question: {vector_db_question}")
+        logger.debug("Vector DB question: %s", vector_db_question)
         vector_store = self.index
         filter_dict = {
             "user_ids": {"$eq": user_id}
@@ -560,10 +601,16 @@ class QAService:
 
         # Send the question to OpenAI
         response = await self.llm.ainvoke(question)
-        print(f"Classify query response: {response.content}")
+        logger.debug("Classify query response: %s", response.content)
         
         #content is a string, so we need to convert it to a dictionary
         content = json.loads(response.content)
-        print(f"Classify query response as dictionary: {content}")
+        logger.debug("Classify query response as dictionary: %s", content)
         # Return the JSON response
-        return content
\ No newline at end of file
+        return content
+
+
+@lru_cache(maxsize=1)
+def get_qa_service() -> QAService:
+    """Process-wide QAService, so route modules share one set of LLM and vector clients."""
+    return QAService()
@@ -1,8 +1,8 @@
 from typing import Optional, List
+import logging
 from boto3.dynamodb.conditions import Key
 from app.models.user_profile import UserProfile
 from .base_service import BaseService
-import boto3
 import os
 from datetime import datetime, timezone, timedelta
 from langchain.chat_models import ChatOpenAI
@@ -12,15 +12,11 @@ from pinecone import Pinecone
 from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 
+logger = logging.getLogger(__name__)
+
 class UserProfileService(BaseService):
     def __init__(self, table_name: str = None):
         super().__init__(table_name)
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION')
-        )
 
         # Initialize embedding model
         self.embeddings = OpenAIEmbeddings(
@@ -99,7 +95,7 @@ class UserProfileService(BaseService):
         user = user_service.get_user_by_id(user_id)
 
         user_name = user.name if user else "Unknown"
-        print("BUILDING PROFILE FOR USER", user_name)
+        logger.debug("Building profile for user %s", user_name)
         user_role = user.role if user else "Unknown"
         user_bio = user.bio if user else "No bio available"
         
@@ -142,7 +138,7 @@ class UserProfileService(BaseService):
                 start_timestamp_epoch = end_timestamp_epoch
                 end_timestamp_epoch += 86400
 
-            print(f"Retrieved {len(message_groups)} message groups")  
+            logger.debug("Retrieved %d message groups", len(message_groups))
             if len(message_groups) == 0:
                 break
             
@@ -203,7 +199,7 @@ class UserProfileService(BaseService):
                 most_recent_profile = new_profile
             
 
-        print(f"User profiles updated for user_id: {user_id}") 
+        logger.info("User profiles updated for user_id: %s", user_id)
 
     async def update_all_personas(self):
         """Update profiles for all users of type persona."""
@@ -218,4 +214,4 @@ class UserProfileService(BaseService):
             user_id = item['id']
             await self.update_user_profiles(user_id)
 
-        print("All persona profiles updated.") 
\ No newline at end of file
+        logger.info("All persona profiles updated.")
\ No newline at end of file
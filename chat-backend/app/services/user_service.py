@@ -11,18 +11,23 @@ from typing import Optional, List, Dict, Set
 from boto3.dynamodb.conditions import Key, Attr
 from app.models.user import User
 from .base_service import BaseService
-import boto3
-import os
+import threading
+import logging
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Process-wide email -> user ID cache; emails are fixed at signup, so only the
+# TTL bounds how long an entry lives
+_USER_ID_BY_EMAIL_CACHE = TTLCache(maxsize=4096, ttl=600)
+# Recently read user records, for callers that only need identity fields
+# (id/name/email) and can tolerate a status that is up to a minute old
+_USER_CACHE = TTLCache(maxsize=10_000, ttl=60)
+_CACHE_LOCK = threading.Lock()
 
 class UserService(BaseService):
     def __init__(self, table_name: str = None):
         super().__init__(table_name)
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION')
-        )
         
     def create_bot_user(self, email: str, name: str = "Bot") -> User:
         """Create a new bot user"""
@@ -77,7 +82,7 @@ class UserService(BaseService):
             if not role:
                 raise ValueError("Role is required for persona users")
             if password:
-                print("Warning: Password provided for persona user will be ignored")
+                logger.warning("Password provided for persona user will be ignored")
                 password = None
         
         user_id = id or self._generate_id()
@@ -109,12 +114,11 @@ class UserService(BaseService):
             self.table.put_item(Item=item)
             return User(**self._clean_item(item))
         except Exception as e:
-            print(f"Error creating user {name}: {str(e)}")
+            logger.exception("Error creating user %s", name)
             raise e
 
     def get_user_by_name(self, name: str) -> Optional[User]:
         """Get a user by their username."""
-        print(f"\n=== Getting user by name: {name} ===")
         try:
             response = self.table.query(
                 IndexName='GSI4',
@@ -123,17 +127,15 @@ class UserService(BaseService):
             
             if response['Items']:
                 item = response['Items'][0]
-                print(f"Found user: {item['name']} (id: {item['id']})")
                 return User(**self._clean_item(item))
-            print("No user found with this username")
+            logger.debug("No user found with name %s", name)
             return None
         except Exception as e:
-            print(f"Error getting user by name: {str(e)}")
+            logger.exception("Error getting user by name %s", name)
             raise
 
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get a user by their email address."""
-        print(f"\n=== Getting user by email: {email} ===")
         try:
             response = self.table.query(
                 IndexName='GSI2',
@@ -142,14 +144,28 @@ class UserService(BaseService):
             
             if response['Items']:
                 item = response['Items'][0]
-                print(f"Found user: {item['name']} (id: {item['id']})")
                 return User(**self._clean_item(item))
-            print("No user found with this email")
+            logger.debug("No user found with email %s", email)
             return None
         except Exception as e:
-            print(f"Error getting user by email: {str(e)}")
+            logger.exception("Error getting user by email %s", email)
             raise
 
+    def get_user_id_by_email(self, email: str) -> Optional[str]:
+        """Resolve an email address to a user ID, caching hits in-process."""
+        cache_key = (self.table.name, email)
+        with _CACHE_LOCK:
+            user_id = _USER_ID_BY_EMAIL_CACHE.get(cache_key)
+        if user_id:
+            return user_id
+            
+        user = self.get_user_by_email(email)
+        if not user:
+            return None
+        with _CACHE_LOCK:
+            _USER_ID_BY_EMAIL_CACHE[cache_key] = user.id
+        return user.id
+
     def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get a user by their ID."""
         try:
@@ -161,14 +177,13 @@ class UserService(BaseService):
             )
             
             if 'Item' not in response:
-                print(f"No user found with ID: {user_id}")
+                logger.debug("No user found with ID %s", user_id)
                 return None
                 
             item = response['Item']
             return User(**self._clean_item(item))
         except Exception as e:
-            print(f"Error getting user by ID: {str(e)}")
-            print(f"Error type: {type(e)}")
+            logger.exception("Error getting user by ID %s", user_id)
             raise
 
     def update_user_status(self, user_id: str, status: str) -> Optional[User]:
@@ -212,6 +227,16 @@ class UserService(BaseService):
             
         return users
 
+    def search_users(self, query: str) -> List[User]:
+        """Find regular users whose name starts with query."""
+        response = self.table.query(
+            IndexName='GSI1',
+            KeyConditionExpression=Key('GSI1PK').eq('TYPE#user') & 
+                                 Key('GSI1SK').begins_with(f'NAME#{query}')
+        )
+        
+        return [User(**self._clean_item(item)) for item in response['Items']]
+
     def get_persona_users(self) -> List[User]:
         """Get all persona users."""
         response = self.table.query(
@@ -221,24 +246,30 @@ class UserService(BaseService):
         
         return [User(**self._clean_item(item)) for item in response['Items']]
 
-    def _batch_get_users(self, user_ids: Set[str]) -> List[User]:
-        """Batch get multiple users by their IDs."""
+    def _batch_get_users(self, user_ids: Set[str], cached: bool = False) -> List[User]:
+        """Batch get multiple users by their IDs.
+        
+        With cached=True, users read in the last minute are served from the
+        process-wide user cache and only the rest are fetched.
+        """
         if not user_ids:
             return []
             
-        # DynamoDB batch_get_item has a limit of 100 items
         users = []
-        for chunk in [list(user_ids)[i:i + 100] for i in range(0, len(user_ids), 100)]:
-            request_items = {
-                self.table.name: {
-                    'Keys': [{'PK': f'USER#{user_id}', 'SK': '#METADATA'} for user_id in chunk],
-                    'ConsistentRead': False
-                }
-            }
-            response = self.dynamodb.batch_get_item(RequestItems=request_items)
+        user_ids = set(user_ids)
+        if cached:
+            with _CACHE_LOCK:
+                for user_id in list(user_ids):
+                    user_data = _USER_CACHE.get((self.table.name, user_id))
+                    if user_data is not None:
+                        users.append(User(**user_data))
+                        user_ids.discard(user_id)
             
-            for item in response['Responses'][self.table.name]:
-                users.append(User(**self._clean_item(item)))
+        for item in self._batch_get_items([{'PK': f'USER#{user_id}', 'SK': '#METADATA'} for user_id in user_ids]):
+            user_data = self._clean_item(item)
+            with _CACHE_LOCK:
+                _USER_CACHE[(self.table.name, user_data['id'])] = user_data
+            users.append(User(**user_data))
                 
         return users 
 
@@ -1,5 +1,8 @@
 import re
-from typing import List, Dict, Optional, Literal
+import asyncio
+import logging
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Optional, Literal, Tuple, Union
 import os
 from datetime import datetime, timedelta
 from langchain_openai import OpenAIEmbeddings
@@ -13,6 +16,7 @@ from .user_service import UserService
 from ..models.channel import Channel
 from ..models.message import Message
 from ..models.workspace import Workspace
+from ..models.user import User
 from dotenv import load_dotenv
 from pinecone import Pinecone
 
@@ -20,15 +24,24 @@ from pinecone import Pinecone
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 MESSAGES_PER_VECTOR = 10
+INDEX_CONCURRENCY = 16  # channels indexed at once by index_workspace
+WORKSPACE_INDEX_CONCURRENCY = 4  # workspaces indexed at once by index_all_workspaces
+
+# Table item holding the index version. Every process bumps it after writing to the
+# index and routes fold it into ETags, so clients re-fetch search/context results
+# after a reindex done anywhere (another instance, the backfill scripts)
+INDEX_VERSION_KEY = {'PK': 'VECTOR_INDEX', 'SK': '#VERSION'}
 
 class VectorService:
     def __init__(self, table_name: str = None):
         """Initialize vector service with connections to other services and Pinecone"""
         self.message_service = MessageService(table_name)
-        self.channel_service = ChannelService(table_name)
         self.user_service = UserService(table_name)
         self.workspace_service = WorkspaceService(table_name)
+        self.channel_service = ChannelService(table_name, user_service=self.user_service, workspace_service=self.workspace_service)
         
         # Initialize embedding model with explicit API key
         self.embeddings = OpenAIEmbeddings(
@@ -38,7 +51,7 @@ class VectorService:
         self.index_name = os.getenv("PINECONE_INDEX")
         self.pinecone = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
         os.environ["PINECONE_API_KEY"] = os.getenv("PINECONE_API_KEY")
-        print(f"Index name: {self.index_name}")
+        logger.debug("Index name: %s", self.index_name)
         
         # Initialize Pinecone vector store
         self.index = PineconeVectorStore(
@@ -54,8 +67,9 @@ class VectorService:
         
     def _prepare_message_metadata(self, message: Message, channel_name: str) -> Dict:
         """Prepare metadata for a message"""
-        # Get user for name
-        user = self.user_service.get_user_by_id(message.user_id)
+        # Get user for name; messages from get_messages already carry their
+        # batch-fetched author, so only bare messages need a lookup
+        user = message.user if isinstance(message.user, User) else self.user_service.get_user_by_id(message.user_id)
         
         # Get channel for workspace
         channel = self.channel_service.get_channel_by_id(message.channel_id)
@@ -93,17 +107,48 @@ class VectorService:
 
     async def index_workspace(self, workspace_id: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, is_grouped: bool = False):
         """Index all channels in a workspace"""
-        
+        errors = []
+        async for _, result in self.index_workspace_progress(workspace_id, start_date, end_date, is_grouped):
+            if isinstance(result, Exception):
+                errors.append(result)
+        if errors:
+            raise errors[0]
+
+    async def index_workspace_progress(self, workspace_id: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, is_grouped: bool = False) -> AsyncIterator[Tuple[Channel, Union[int, Exception]]]:
+        """Index all channels in a workspace, yielding each channel as it finishes
+
+        Yields:
+            (channel, result) pairs in completion order, where result is the number
+            of messages indexed or the exception that channel raised
+        """
         workspace_name = self.workspace_service.get_workspace_name_by_id(workspace_id)
-        print(f"Indexing workspace {workspace_name}")
+        logger.debug("Indexing workspace %s", workspace_name)
         if not workspace_name:
             raise ValueError(f"Workspace {workspace_id} not found")
 
         # Get all channels in the workspace
         channels = self.channel_service.get_workspace_channels(workspace_id)
-        print(f"Found {len(channels)} channels in workspace {workspace_name}")
-        for channel in channels:
-            await self.index_channel(channel.id, start_date, end_date, is_grouped)
+        logger.debug("Found %s channels in workspace %s", len(channels), workspace_name)
+        
+        # Channels are independent, so index them concurrently; the semaphore
+        # keeps the fan-out from flooding OpenAI, Pinecone and DynamoDB
+        semaphore = asyncio.Semaphore(INDEX_CONCURRENCY)
+        
+        async def index_one(channel: Channel) -> Tuple[Channel, Union[int, Exception]]:
+            async with semaphore:
+                try:
+                    return channel, await self.index_channel(channel.id, start_date, end_date, is_grouped)
+                except Exception as e:
+                    return channel, e
+        
+        tasks = [asyncio.ensure_future(index_one(channel)) for channel in channels]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer went away early; don't leave channels indexing in the background
+            for task in tasks:
+                task.cancel()
 
     async def index_channel(self, channel_id: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, is_grouped: bool = False) -> int:
         """Index all messages in a channel"""
@@ -119,7 +164,8 @@ class VectorService:
         end_time = end_date.isoformat() if end_date else None
 
         # Get messages
-        messages = self.message_service.get_messages(channel_id, start_time=start_time, end_time=end_time)
+        # Off the event loop so concurrently indexed channels overlap their reads
+        messages = await asyncio.to_thread(self.message_service.get_messages, channel_id, start_time=start_time, end_time=end_time)
         if not messages:
             return 0
 
@@ -132,8 +178,26 @@ class VectorService:
         else:
             await self.index_grouped_messages(channel_id, messages, workspace)
 
+        self.bump_index_version()
         return len(messages)
 
+    def index_version(self) -> int:
+        """Current shared index version, 0 before the first bump."""
+        response = self.user_service.table.get_item(
+            Key=INDEX_VERSION_KEY,
+            ProjectionExpression='version',
+            ConsistentRead=True
+        )
+        return int(response.get('Item', {}).get('version', 0))
+
+    def bump_index_version(self) -> None:
+        """Record that the index changed, for every process serving ETags."""
+        self.user_service.table.update_item(
+            Key=INDEX_VERSION_KEY,
+            UpdateExpression='ADD version :one',
+            ExpressionAttributeValues={':one': 1}
+        )
+
     async def index_user(self, user_id: str) -> bool:
         """Index a user's profile information
         
@@ -162,11 +226,12 @@ class VectorService:
                 namespace="users"
             )
             
-            print(f"Successfully indexed profile for user {user.name}")
+            self.bump_index_version()
+            logger.debug("Successfully indexed profile for user %s", user.name)
             return True
             
         except Exception as e:
-            print(f"Error indexing user {user_id}: {str(e)}")
+            logger.error("Error indexing user %s: %s", user_id, e)
             return False
         
     async def search_similar(
@@ -256,7 +321,7 @@ class VectorService:
 
     async def index_grouped_messages(self, channel_id: str, messages: List[Message], workspace: Workspace) -> int:
         """Index messages in groups based on MESSAGES_PER_VECTOR and threads"""
-        print(f"Indexing grouped messages for channel {channel_id}")
+        logger.debug("Indexing grouped messages for channel %s", channel_id)
         channel = self.channel_service.get_channel_by_id(channel_id)
         if not channel:
             raise ValueError(f"Channel {channel_id} not found")
@@ -330,9 +395,9 @@ class VectorService:
         
         
         if thread_id:
-            print(f"Thread ID: {thread_id}")
-            print(f"Metadata: {metadata}")
-            print(f"Messages: {messages}")
+            logger.debug("Thread ID: %s", thread_id)
+            logger.debug("Metadata: %s", metadata)
+            logger.debug("Messages: %s", messages)
 
         # Index the vector
         await index.aadd_texts([content], [metadata], namespace="grouped_messages")
@@ -359,5 +424,21 @@ class VectorService:
     async def index_all_workspaces(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, is_grouped: bool = False):
         """Index all workspaces with optional start and end dates"""
         workspaces = self.workspace_service.get_all_workspaces()
-        for workspace in workspaces:
-            await self.index_workspace(workspace.id, start_date, end_date, is_grouped) 
\ No newline at end of file
+        # Workspaces are independent too; each already fans out over its channels,
+        # so only a few run at once
+        semaphore = asyncio.Semaphore(WORKSPACE_INDEX_CONCURRENCY)
+
+        async def index_one(workspace_id: str):
+            async with semaphore:
+                await self.index_workspace(workspace_id, start_date, end_date, is_grouped)
+
+        results = await asyncio.gather(*(index_one(workspace.id) for workspace in workspaces), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            raise errors[0]
+
+
+@lru_cache(maxsize=1)
+def get_vector_service() -> VectorService:
+    """Process-wide VectorService for the default table."""
+    return VectorService()
@@ -1,13 +1,15 @@
 from __future__ import annotations
-from typing import Optional, List, Tuple
+from typing import Iterable, Optional, List, Set, Tuple
 from datetime import datetime
 from .base_service import BaseService
 from ..models.workspace import Workspace
-import boto3
-import os
 from boto3.dynamodb.conditions import Key
-from uuid import uuid4
 from ..models.user import User
+import threading
+import logging
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
 
 # WorkspaceService Schema:
 # - Primary Key (PK): WORKSPACE#{workspace_id}
@@ -22,20 +24,31 @@ from ..models.user import User
 #   - Workspaces by name
 #   - Metadata retrieval for workspaces
 
+# Workspace metadata is never updated after creation, so lookups by ID are cached
+# process-wide (keyed by table name); only the TTL bounds an entry's life
+_WORKSPACE_CACHE = TTLCache(maxsize=1024, ttl=600)
+_CACHE_LOCK = threading.Lock()
+
 class WorkspaceService(BaseService):
     def __init__(self, table_name: str = None):
         super().__init__(table_name)
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION')
-        )
+        self._channel_service = None
+
+    @property
+    def channel_service(self):
+        """ChannelService on the same table, built on first use and then reused.
         
+        Created lazily because ChannelService itself holds a WorkspaceService;
+        this one is handed in so the pair share their services.
+        """
+        if self._channel_service is None:
+            from .channel_service import ChannelService  # Local import to avoid circular dependency
+            self._channel_service = ChannelService(self.table.name, workspace_service=self)
+        return self._channel_service
 
     def create_workspace(self, name: str) -> Workspace:
         """Create a new workspace."""
-        workspace_id = str(uuid4())
+        workspace_id = self._generate_id()
         timestamp = datetime.utcnow().isoformat()
         self.table.put_item(
             Item={
@@ -49,21 +62,17 @@ class WorkspaceService(BaseService):
                 'id': workspace_id
             }
         )
-        # Verify that the item was stored
-        response = self.table.get_item(
-            Key={
-                'PK': f'WORKSPACE#{workspace_id}',
-                'SK': '#METADATA'
-            }
-        )
-        if 'Item' in response:
-            print("Stored Workspace Item:", response['Item'])
-        else:
-            print("Workspace item not found after creation.")
+        logger.debug("Created workspace %s (%s)", name, workspace_id)
         return Workspace(id=workspace_id, name=name, created_at=timestamp, entity_type='WORKSPACE')
 
     def get_workspace_by_id(self, workspace_id: str) -> Optional[Workspace]:
         """Get a workspace by its ID."""
+        cache_key = (self.table.name, workspace_id)
+        with _CACHE_LOCK:
+            workspace_data = _WORKSPACE_CACHE.get(cache_key)
+        if workspace_data is not None:
+            return Workspace(**workspace_data)
+            
         response = self.table.get_item(
             Key={
                 'PK': f'WORKSPACE#{workspace_id}',
@@ -73,12 +82,14 @@ class WorkspaceService(BaseService):
         if 'Item' not in response:
             return None
         item = response['Item']
-        return Workspace(id=item['id'], name=item['name'], created_at=item['created_at']) 
+        workspace_data = {'id': item['id'], 'name': item['name'], 'created_at': item['created_at']}
+        with _CACHE_LOCK:
+            _WORKSPACE_CACHE[cache_key] = workspace_data
+        return Workspace(**workspace_data)
 
     def get_all_workspaces(self, user_id: str = None) -> List[Workspace]:
         """Get all unique workspaces using the entity_type index, handling pagination internally."""
-        from .channel_service import ChannelService  # Local import to avoid circular dependency
-        channel_service = ChannelService()
+        channel_service = self.channel_service
         unique_workspaces = {}
         last_evaluated_key = None
         while True:
@@ -111,55 +122,72 @@ class WorkspaceService(BaseService):
     def get_workspace_name_by_id(self, workspace_id: str) -> Optional[str]:
         """Get the workspace name by its ID."""
         workspace = self.get_workspace_by_id(workspace_id)
-        print(f"Workspace name: {workspace.name}")
         return workspace.name if workspace else None 
 
     def get_workspace_by_name(self, name: str) -> Optional[Workspace]:
         """Get a workspace by its name using GSI2PK."""
-        print(f"Querying GSI2 for workspace name: {name}")
         response = self.table.query(
             IndexName='GSI2',
             KeyConditionExpression=Key('GSI2PK').eq(f'WORKSPACE_NAME#{name}')
         )
-        print(f"Query response: {response}")
         if 'Items' not in response or not response['Items']:
-            print("No items found for the given workspace name.")
+            logger.debug("No workspace named %s", name)
             return None
         item = response['Items'][0]
-        print(f"Found workspace item: {item}")
         return Workspace(id=item['id'], name=item['name'], created_at=item['created_at']) 
 
     def get_users_by_workspace(self, workspace_id: str) -> List[User]:
         """Get all users who are members of at least one channel in the workspace."""
-        from .channel_service import ChannelService  # Local import to avoid circular dependency
-        from .user_service import UserService
-
-        channel_service = ChannelService()
-        user_service = UserService()
+        channel_service = self.channel_service
 
         # Get all channels in the workspace
         channels = channel_service.get_workspace_channels(workspace_id)
 
         # Collect all unique user IDs from these channels
-        user_ids = set()
-        for channel in channels:
-            members = channel_service.get_channel_members(channel.id)
-            user_ids.update(member['id'] for member in members)
+        member_ids = channel_service.get_member_ids_for_channels([channel.id for channel in channels])
+        user_ids = {user_id for ids in member_ids.values() for user_id in ids}
 
         # Retrieve user details based on these IDs
-        users = user_service.get_users_by_ids(list(user_ids))
+        users = channel_service.user_service.get_users_by_ids(list(user_ids))
 
         return users 
 
-    def add_user_to_workspace(self, workspace_id: str, user_id: str):
-        # Add a user to a workspace
-        item = {
+    def _workspace_member_item(self, workspace_id: str, user_id: str) -> dict:
+        return {
             'PK': f'WORKSPACE#{workspace_id}',
             'SK': f'MEMBER#{user_id}',
             'GSI5PK': f'USER#{user_id}',
             'GSI5SK': f'WORKSPACE#{workspace_id}'
         }
-        self.dynamodb.put_item(Item=item)
+
+    def add_user_to_workspace(self, workspace_id: str, user_id: str):
+        # Add a user to a workspace
+        self.table.put_item(Item=self._workspace_member_item(workspace_id, user_id))
+
+    def add_users_to_workspace(self, workspace_id: str, user_ids: Iterable[str]):
+        """Add several users to a workspace.
+        
+        The batch writer sends the member items 25 at a time with BatchWriteItem
+        and retries any unprocessed ones.
+        """
+        with self.table.batch_writer() as batch:
+            for user_id in user_ids:
+                batch.put_item(Item=self._workspace_member_item(workspace_id, user_id))
+
+    def get_workspace_member_ids(self, workspace_id: str) -> Set[str]:
+        """Get the IDs of users with a member record in the workspace."""
+        query_params = {
+            'KeyConditionExpression': Key('PK').eq(f'WORKSPACE#{workspace_id}') & 
+                                    Key('SK').begins_with('MEMBER#'),
+            'ProjectionExpression': 'SK'
+        }
+        user_ids = set()
+        while True:
+            response = self.table.query(**query_params)
+            user_ids.update(item['SK'].split('#')[1] for item in response['Items'])
+            if 'LastEvaluatedKey' not in response:
+                return user_ids
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
 
     def get_workspaces_by_user(self, user_id: str) -> List[str]:
         # Retrieve all workspaces a user is a member of
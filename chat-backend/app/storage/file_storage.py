@@ -1,33 +1,48 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import os
+import logging
+from typing import Dict, List
 from werkzeug.utils import secure_filename
 
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_URL_TTL = 86400  # seconds
+
+# Large attachments go up as 8 MiB parts, four at a time per file
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+    use_threads=True
+)
+# Enough connections for every attachment upload worker to run its parts in parallel
+S3_CONFIG = Config(max_pool_connections=64)
+
 class FileStorage:
     def __init__(self):
-        print("\n=== Initializing FileStorage ===")
         self.s3 = boto3.client(
             's3',
             aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
             aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION')
+            region_name=os.getenv('AWS_REGION'),
+            config=S3_CONFIG
         )
         self.bucket_name = os.environ.get('S3_BUCKET_NAME', 'chatgenius-jrw')
-        print(f"Using bucket: {self.bucket_name}")
+        logger.debug("FileStorage using bucket %s", self.bucket_name)
 
     def save_file(self, file, filename):
-        print(f"\n=== Saving file: {filename} ===")
         try:
-            print("Attempting S3 upload...")
-            self.s3.upload_fileobj(file, self.bucket_name, filename)
-            print("Upload successful")
+            self.s3.upload_fileobj(file, self.bucket_name, filename, Config=TRANSFER_CONFIG)
+            logger.debug("Uploaded %s to S3", filename)
             return True
         except Exception as e:
-            print(f"Upload failed: {str(e)}")
-            print(f"Error type: {type(e)}")
+            logger.error("Upload of %s failed: %s: %s", filename, type(e).__name__, e)
             return False
 
-    def get_file_url(self, filename: str) -> str:
+    def get_file_url(self, filename: str, expires_in: int = 3600) -> str:
         try:
             url = self.s3.generate_presigned_url(
                 'get_object',
@@ -35,10 +50,38 @@ class FileStorage:
                     'Bucket': self.bucket_name,
                     'Key': filename
                 },
-                ExpiresIn=3600
+                ExpiresIn=expires_in
             )
             return url
         except Exception as e:
-            print(f"Failed to generate URL: {str(e)}")
-            print(f"Error type: {type(e)}")
-            raise ValueError(f"File {filename} not found") 
\ No newline at end of file
+            logger.error("Failed to generate URL for %s: %s: %s", filename, type(e).__name__, e)
+            raise ValueError(f"File {filename} not found")
+
+    def sign_attachments(self, messages: List[Dict], expires_in: int = ATTACHMENT_URL_TTL) -> List[Dict]:
+        """Add presigned download URLs to API-shaped messages as attachmentUrls.
+        
+        Presigning happens locally without an S3 request, so embedding the URLs
+        spares clients one /uploads/<filename> round-trip per attachment; that
+        route remains for refreshing expired links and for any file that could
+        not be signed here.
+        """
+        for message in messages:
+            attachments = message.get('attachments')
+            if not attachments:
+                continue
+            urls = {}
+            for name in attachments:
+                try:
+                    urls[name] = self.get_file_url(name, expires_in)
+                except ValueError:
+                    continue
+            message['attachmentUrls'] = urls
+        return messages
+
+    def sign_message(self, message: Dict) -> Dict:
+        """sign_attachments for a single API-shaped message, returned for chaining."""
+        return self.sign_attachments([message])[0]
+
+
+# Shared by the route modules so the process holds a single S3 client and connection pool
+file_storage = FileStorage()
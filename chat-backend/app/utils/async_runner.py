@@ -0,0 +1,56 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable, Coroutine, Iterator, Optional
+
+from eventlet import patcher, tpool
+
+
+def _on_os_thread(fn: Callable, *args) -> Any:
+    """Call fn on a real OS thread when eventlet has monkey-patched threading.
+
+    Under the eventlet worker every request is a green thread on one OS thread,
+    so two requests driving asyncio loops at once would collide ("cannot be
+    called from a running event loop"). tpool runs fn on its native thread pool
+    while the calling green thread yields to the hub. Unpatched (threaded dev
+    server, scripts, tests) each request already has its own thread.
+    """
+    if patcher.is_monkey_patched('thread'):
+        return tpool.execute(fn, *args)
+    return fn(*args)
+
+
+def run_async(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on its own event loop and return its result.
+
+    The QA, vector and bot/persona coroutines make synchronous boto3 calls, so
+    each request drives a private loop; a slow request only blocks itself.
+    """
+    if timeout is not None:
+        coro = asyncio.wait_for(coro, timeout)
+    return _on_os_thread(asyncio.run, coro)
+
+
+def iterate_async(agen: AsyncIterator) -> Iterator:
+    """Drive an async iterator on a private event loop, yielding its items to sync code.
+
+    Used to stream results from async services through a Flask response; the
+    loop lives as long as the iteration, and the iterator is closed on it if
+    the consumer stops early.
+    """
+    async def next_item():
+        return await agen.__anext__()
+
+    loop = _on_os_thread(asyncio.new_event_loop)
+    try:
+        while True:
+            try:
+                item = _on_os_thread(loop.run_until_complete, next_item())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        try:
+            _on_os_thread(loop.run_until_complete, agen.aclose())
+            _on_os_thread(loop.run_until_complete, loop.shutdown_asyncgens())
+            _on_os_thread(loop.run_until_complete, loop.shutdown_default_executor())
+        finally:
+            loop.close()
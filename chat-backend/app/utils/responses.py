@@ -0,0 +1,66 @@
+from decimal import Decimal
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+import orjson
+
+
+def _default(obj):
+    """Serialize types orjson does not handle natively, matching Flask's jsonify."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def ojsonify(obj, status: int = 200) -> Response:
+    """Build a JSON response with orjson instead of Flask's stdlib-json jsonify.
+    
+    Model objects may be passed directly (e.g. a list of Messages); orjson calls
+    their to_dict while encoding, so no intermediate list of dicts is built.
+    Dataclasses are passed through to _default rather than serialized natively,
+    which would emit field names instead of the API's camelCase keys.
+    """
+    return Response(
+        orjson.dumps(obj, default=_default, option=orjson.OPT_PASSTHROUGH_DATACLASS),
+        status=status,
+        mimetype='application/json'
+    )
+
+
+class OrjsonModule:
+    """json-module shim so python-socketio encodes emitted packets with orjson.
+    
+    Socket.IO calls dumps/loads with stdlib keyword arguments (e.g. separators);
+    orjson's output is already compact, so those are ignored.
+    """
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs) -> str:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_PASSTHROUGH_DATACLASS).decode()
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+    
+    Installed as app.json, so request.get_json() and jsonify() in every route
+    parse and encode with orjson rather than the stdlib json module. Stdlib
+    keyword arguments (sort_keys, indent) are ignored.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_PASSTHROUGH_DATACLASS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=orjson.OPT_PASSTHROUGH_DATACLASS),
+            mimetype=self.mimetype
+        )
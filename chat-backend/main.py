@@ -1,12 +1,19 @@
-from app import create_app
-from app.db.ddb import DynamoDB
+# Patch blocking I/O (sockets, boto3's HTTP pool, threads) before anything else is
+# imported so one eventlet worker can overlap many in-flight DynamoDB calls.
+# asyncio cannot run in overlapping green threads, so app.utils.async_runner
+# hands each coroutine to eventlet's native thread pool (EVENTLET_THREADPOOL_SIZE).
+import eventlet
+eventlet.monkey_patch()
+
+from app import create_app, socketio
+from app.db.ddb import get_db
 import logging
 from app.services.user_service import UserService
 
 logging.basicConfig(level=logging.INFO)
 
 app = create_app()
-db = DynamoDB()
+db = get_db()
 
 print("\n=== DynamoDB Configuration ===")
 print(f"Table name: {db.table.name}")
@@ -23,4 +30,4 @@ except Exception as e:
     print(f"Error creating bot user: {str(e)}")
 
 if __name__ == '__main__':
-    app.run(debug=True) 
\ No newline at end of file
+    socketio.run(app, debug=True) 
\ No newline at end of file
@@ -213,18 +213,17 @@ source venv/bin/activate
 
 # Install Python packages
 pip install -r requirements.txt
-pip install gunicorn eventlet
 
 # Configure Supervisor
 cat > /etc/supervisor/conf.d/chat-app.conf << 'EOF'
 [program:chat-app]
 directory=/var/www/chat-app/chat-backend
-command=/var/www/chat-app/chat-backend/venv/bin/gunicorn --worker-class eventlet -w 1 app:app -b 127.0.0.1:5000
+command=/var/www/chat-app/chat-backend/venv/bin/gunicorn --worker-class eventlet -w 1 --worker-connections 2000 main:app -b 127.0.0.1:5000
 autostart=true
 autorestart=true
 stderr_logfile=/var/log/chat-app.err.log
 stdout_logfile=/var/log/chat-app.out.log
-environment=PYTHONPATH="/var/www/chat-app/chat-backend"
+environment=PYTHONPATH="/var/www/chat-app/chat-backend",EVENTLET_THREADPOOL_SIZE="32"
 EOF
 
 # Configure Nginx
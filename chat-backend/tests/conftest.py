@@ -11,6 +11,9 @@ from pathlib import Path
 import sys
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from tests.utils import create_chat_table
+from app.services.channel_service import _CHANNEL_CACHE, _MEMBER_CACHE, _CHANNEL_NAME_CACHE
+from app.services.user_service import _USER_CACHE, _USER_ID_BY_EMAIL_CACHE
+from app.services.workspace_service import _WORKSPACE_CACHE
 
 # @pytest.fixture(scope="session", autouse=True)
 # def flask_server():
@@ -184,6 +187,14 @@ from tests.utils import create_chat_table
 #     print("Frontend server failed to start within 30 seconds")
 #     return False
 
+@pytest.fixture(autouse=True)
+def clear_service_caches():
+    """The process-wide service caches outlive each test's mocked table, and ids and
+    DM names repeat across tests, so start every test with them empty."""
+    for cache in (_CHANNEL_CACHE, _MEMBER_CACHE, _CHANNEL_NAME_CACHE,
+                  _USER_CACHE, _USER_ID_BY_EMAIL_CACHE, _WORKSPACE_CACHE):
+        cache.clear()
+
 @pytest.fixture(scope="function")
 def test_db():
     """Test database fixture"""
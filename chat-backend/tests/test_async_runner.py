@@ -0,0 +1,44 @@
+import subprocess
+import sys
+from pathlib import Path
+
+RUNNER_PATH = Path(__file__).parent.parent / 'app' / 'utils' / 'async_runner.py'
+
+# Runs in a child process: monkey-patching the pytest process would leak into every other test
+OVERLAPPING_CALLS = '''
+import eventlet
+eventlet.monkey_patch()
+import asyncio
+import importlib.util
+import sys
+import time
+
+spec = importlib.util.spec_from_file_location('async_runner', sys.argv[1])
+async_runner = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(async_runner)
+
+async def work(value):
+    await asyncio.sleep(0.2)
+    time.sleep(0.05)  # a blocking boto3 call inside the coroutine
+    return value
+
+async def numbers():
+    for i in range(3):
+        await asyncio.sleep(0.05)
+        yield i
+
+pool = eventlet.GreenPool()
+started = time.monotonic()
+assert list(pool.imap(lambda v: async_runner.run_async(work(v)), range(5))) == list(range(5))
+assert time.monotonic() - started < 0.8, "green requests ran one after another"
+assert list(pool.imap(lambda _: list(async_runner.iterate_async(numbers())), range(3))) == [[0, 1, 2]] * 3
+'''
+
+
+def test_overlapping_run_async_under_eventlet():
+    """Concurrent green requests each get a loop on a real thread instead of colliding."""
+    result = subprocess.run(
+        [sys.executable, '-c', OVERLAPPING_CALLS, str(RUNNER_PATH)],
+        capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
@@ -6,6 +6,7 @@ from app.services.channel_service import ChannelService
 from app.services.user_service import UserService
 from tests.utils import create_chat_table
 from app.services.message_service import MessageService
+from app.services.base_service import BATCH_GET_MAX_ATTEMPTS
 
 @pytest.fixture
 def aws_credentials():
@@ -92,11 +93,45 @@ def test_create_dm_channel(ddb, user_service):
     member_names = {m['name'] for m in channel.members}
     assert member_names == {"User One", "User Two"}
 
+def test_get_channel_with_members(ddb, user_service):
+    """Test getting a channel and its members in one call."""
+    create_test_user(user_service, "user1", "User One")
+    create_test_user(user_service, "user2", "User Two")
+    
+    dm = ddb.create_channel(name="dm", type="dm", created_by="user1", other_user_id="user2")
+    public = ddb.create_channel(name="public", type="public", created_by="user1")
+    
+    channel = ddb.get_channel_with_members(dm.id)
+    assert channel.type == "dm"
+    assert {m['name'] for m in channel.members} == {"User One", "User Two"}
+    
+    # Members are skipped for channel types outside member_types
+    channel = ddb.get_channel_with_members(public.id, member_types={'dm'})
+    assert channel.name == "public"
+    assert channel.members == []
+    
+    assert ddb.get_channel_with_members("nonexistent") is None
+
 def test_get_channel_by_id_nonexistent(ddb, user_service):
     """Test getting a non-existent channel."""
     channel = ddb.get_channel_by_id("nonexistent")
     assert channel is None
 
+def test_get_channels_by_ids(ddb, user_service):
+    """Test fetching several channels at once."""
+    create_test_user(user_service, "test_user", "Test User")
+    channels = [
+        ddb.create_channel(f"batch-channel{i}", "public", created_by="test_user")
+        for i in range(3)
+    ]
+    # Warm the cache for one channel so both the cached and batched paths run
+    ddb.get_channel_by_id(channels[0].id)
+    
+    found = ddb.get_channels_by_ids([c.id for c in channels] + ["nonexistent"])
+    
+    assert set(found) == {c.id for c in channels}
+    assert found[channels[1].id].name == "batch-channel1"
+
 def test_get_channels_for_user(ddb, user_service):
     """Test getting all channels for a user."""
     # Create test users
@@ -118,6 +153,44 @@ def test_get_channels_for_user(ddb, user_service):
     channel_names = {c.name for c in user_channels}
     assert channel_names == {"channel0", "channel1", "channel2"}
 
+def test_get_channels_for_user_retries_unprocessed_keys(ddb, user_service, monkeypatch):
+    """Keys DynamoDB leaves unprocessed are re-requested until read."""
+    create_test_user(user_service, "test_user", "Test User")
+    channels = [
+        ddb.create_channel(f"retry-channel{i}", "public", created_by="test_user")
+        for i in range(2)
+    ]
+    
+    real_batch_get_item = ddb.dynamodb.batch_get_item
+    calls = []
+    def throttled_batch_get_item(RequestItems):
+        calls.append(RequestItems)
+        if len(calls) == 1:
+            # Hand back every key unread, as a throttled request would
+            return {'Responses': {}, 'UnprocessedKeys': RequestItems}
+        return real_batch_get_item(RequestItems=RequestItems)
+    monkeypatch.setattr(ddb.dynamodb, 'batch_get_item', throttled_batch_get_item)
+    monkeypatch.setattr('app.services.base_service.time.sleep', lambda seconds: None)
+    
+    user_channels = ddb.get_channels_for_user("test_user")
+    
+    assert len(calls) == 2
+    assert {c.id for c in user_channels} == {c.id for c in channels}
+
+def test_batch_get_items_gives_up_under_persistent_throttling(ddb, monkeypatch):
+    """UnprocessedKeys are retried a bounded number of times, then dropped."""
+    calls = []
+    def throttled_batch_get_item(RequestItems):
+        calls.append(RequestItems)
+        return {'Responses': {}, 'UnprocessedKeys': RequestItems}
+    monkeypatch.setattr(ddb.dynamodb, 'batch_get_item', throttled_batch_get_item)
+    monkeypatch.setattr('app.services.base_service.time.sleep', lambda seconds: None)
+    
+    items = ddb._batch_get_items([{'PK': 'CHANNEL#missing', 'SK': '#METADATA'}])
+    
+    assert items == []
+    assert len(calls) == BATCH_GET_MAX_ATTEMPTS
+
 def test_get_available_channels(ddb, user_service):
     """Test getting available public channels for a user."""
     # Create test users
@@ -138,6 +211,9 @@ def test_get_available_channels(ddb, user_service):
         for i in range(3)
     ]
     
+    # DMs are never offered, even ones the user is not in
+    ddb.create_channel("dm_other", "dm", created_by="other_user")
+    
     # Get available channels
     available = ddb.get_available_channels(user_id)
     
@@ -171,6 +247,11 @@ def test_get_dm_channel(ddb, user_service):
     assert channel.type == "dm"
     member_names = {m['name'] for m in channel.members}
     assert member_names == {"User One", "User Two"}
+    
+    # The reverse order names the same DM, now served from the name cache
+    again = ddb.get_dm_channel(user2_id, user1_id)
+    assert again.id == created.id
+    assert len(again.members) == 2
 
 def test_channel_name_uniqueness(ddb, user_service):
     """Test that public channels with the same name are not allowed."""
@@ -236,6 +317,21 @@ def test_add_channel_member(ddb, user_service):
     member_names = {m['name'] for m in members}
     assert member_names == {"Creator", "New User"}
 
+def test_remove_channel_member(ddb, user_service):
+    """Removing a member revokes access immediately, despite the membership cache."""
+    create_test_user(user_service, "creator", "Creator")
+    create_test_user(user_service, "leaver", "Leaver")
+    channel = ddb.create_channel(name="test-channel", type="public", created_by="creator")
+    ddb.add_channel_member(channel.id, "leaver")
+    assert ddb.is_channel_member(channel.id, "leaver")
+    
+    ddb.remove_channel_member(channel.id, "leaver")
+    
+    assert not ddb.is_channel_member(channel.id, "leaver")
+    assert [m['name'] for m in ddb.get_channel_members(channel.id)] == ["Creator"]
+    with pytest.raises(ValueError, match="User is not a member"):
+        ddb.remove_channel_member(channel.id, "leaver")
+
 def test_add_duplicate_channel_member(ddb, user_service):
     """Test adding a member who is already in the channel."""
     # Create test user
@@ -266,7 +362,32 @@ def test_get_channel_members_empty(ddb, user_service):
     assert len(members) == 1
     assert members[0]['name'] == "Creator"
 
-def test_get_channel_message_count(ddb, user_service):
+def test_get_member_ids_for_channels(ddb, user_service):
+    """Test listing member IDs across channels."""
+    create_test_user(user_service, "user1", "User One")
+    create_test_user(user_service, "user2", "User Two")
+    
+    channel1 = ddb.create_channel("ids-channel1", "public", created_by="user1")
+    channel2 = ddb.create_channel("ids-channel2", "public", created_by="user2")
+    ddb.add_channel_member(channel1.id, "user2")
+    
+    member_ids = ddb.get_member_ids_for_channels([channel1.id, channel2.id])
+    
+    assert sorted(member_ids[channel1.id]) == ["user1", "user2"]
+    assert member_ids[channel2.id] == ["user2"]
+
+def test_get_channel_ids_for_user(ddb, user_service, message_service):
+    """Test listing a user's channel IDs, ignoring their messages on GSI2."""
+    create_test_user(user_service, "user1", "User One")
+    
+    channel1 = ddb.create_channel("user-ids-channel1", "public", created_by="user1")
+    channel2 = ddb.create_channel("user-ids-channel2", "private", created_by="user1")
+    message_service.create_message(channel1.id, "user1", "Hello")
+    
+    assert ddb.get_channel_ids_for_user("user1") == {channel1.id, channel2.id}
+    assert ddb.get_channel_ids_for_user("nobody") == set()
+
+def test_get_channel_message_count(ddb, user_service, message_service):
     """Test getting message count for a channel."""
     # Create test user
     create_test_user(user_service, "user1", "User One")
@@ -278,6 +399,28 @@ def test_get_channel_message_count(ddb, user_service):
         created_by="user1"
     )
 
+    for i in range(5):
+        message_service.create_message(channel.id, "user1", f"Message {i}")
+
+    count = ddb.get_channel_message_count(channel.id)
+    assert count == 5
+
+def test_get_channel_message_count_without_counter(ddb, user_service):
+    """Test counting messages in a channel created before the counter existed."""
+    # Create test user
+    create_test_user(user_service, "user1", "User One")
+
+    # Create a channel and drop its counter
+    channel = ddb.create_channel(
+        name="count-channel",
+        type="public",
+        created_by="user1"
+    )
+    ddb.table.update_item(
+        Key={'PK': f'CHANNEL#{channel.id}', 'SK': '#METADATA'},
+        UpdateExpression='REMOVE message_count'
+    )
+
     # Add some messages using the new format
     timestamp = datetime.now(timezone.utc).isoformat()
     for i in range(5):
@@ -297,6 +440,9 @@ def test_get_channel_message_count(ddb, user_service):
     count = ddb.get_channel_message_count(channel.id)
     assert count == 5
 
+    # A limited count stops early
+    assert ddb.count_messages(channel.id, limit=2) == 2
+
 def test_get_other_dm_user(ddb, user_service):
     """Test getting the other user in a DM channel."""
     # Create test users
@@ -357,6 +503,10 @@ def test_mark_channel_read(ddb, user_service, message_service):
     # Mark channel as read
     ddb.mark_channel_read(channel.id, user.id)
     
+    # The member item snapshots the message counter for later unread counts
+    member = ddb.table.get_item(Key={'PK': f'CHANNEL#{channel.id}', 'SK': f'MEMBER#{user.id}'})['Item']
+    assert member['read_count'] == 3
+    
     # Check unread count is now 0
     channels = ddb.get_channels_for_user(user.id)
     assert len(channels) == 1
@@ -573,6 +723,7 @@ def test_find_channels_without_workspace(ddb, user_service):
     updated_ids = {c.id for c in updated_channels}
     assert 'no-workspace' in updated_ids  # no-workspace
     assert 'empty-workspace' in updated_ids  # empty-workspace
+    assert all(c.workspace_id == "NO_WORKSPACE" for c in updated_channels)
     
     # Verify channels were updated with NO_WORKSPACE
     for channel_id in updated_ids:
@@ -2,7 +2,7 @@ import pytest
 import boto3
 from moto import mock_aws
 from datetime import datetime, timezone
-from app.services.message_service import MessageService
+from app.services.message_service import MessageService, _encode_cursor
 from app.services.user_service import UserService
 from app.services.channel_service import ChannelService
 from app.models.message import Message
@@ -227,6 +227,36 @@ def test_add_reaction(message_service, user_service, channel_service):
     assert "👍" in message.reactions
     assert user.id in message.reactions["👍"]
 
+def test_add_reaction_to_thread_reply(message_service, user_service, channel_service):
+    """Test that reactions on a reply are stored on the reply item"""
+    user = create_test_user(user_service)
+    channel = create_test_channel(channel_service)
+    
+    parent = message_service.create_message(
+        channel_id=channel.id,
+        user_id=user.id,
+        content="Parent message"
+    )
+    reply = message_service.create_message(
+        channel_id=channel.id,
+        user_id=user.id,
+        content="Reply",
+        thread_id=parent.id
+    )
+    
+    message_service.add_reaction(reply.id, user.id, "🎉", thread_id=parent.id)
+    
+    assert message_service.get_message_reactions(reply.id, thread_id=parent.id) == {"🎉": [user.id]}
+    assert message_service.get_message_reactions(parent.id) == {}
+    
+    message_service.remove_reaction(reply.id, user.id, "🎉", thread_id=parent.id)
+    assert message_service.get_message_reactions(reply.id, thread_id=parent.id) == {}
+
+def test_get_message_reactions_missing_message(message_service):
+    """Test that reading reactions of a missing message raises"""
+    with pytest.raises(ValueError, match="Message not found"):
+        message_service.get_message_reactions("missing")
+
 def test_get_thread_messages(message_service, user_service, channel_service):
     """Test retrieving messages in a thread"""
     user = create_test_user(user_service)
@@ -286,6 +316,11 @@ def test_update_message(message_service, user_service, channel_service):
     assert updated.content == "Updated content"
     assert updated.is_edited is True
     assert hasattr(updated, 'edited_at') 
+    assert updated.edit_history[0]['content'] == "Original content"
+    assert updated.user.id == user.id
+    
+    with pytest.raises(ValueError, match="Message not found"):
+        message_service.update_message(message_id="nonexistent", content="Updated content")
 
 def test_get_messages_with_threads(message_service, user_service, channel_service):
     """Test retrieving messages including thread replies"""
@@ -328,6 +363,41 @@ def test_get_messages_with_threads(message_service, user_service, channel_servic
         assert msg.content == f"Reply {i}"
         assert msg.thread_id == parent.id
 
+def test_get_messages_raw_matches_to_dict(message_service, user_service, channel_service):
+    """Test that raw channel messages match the serialized Message objects"""
+    user = create_test_user(user_service)
+    channel = create_test_channel(channel_service)
+    
+    parent = message_service.create_message(
+        channel_id=channel.id,
+        user_id=user.id,
+        content="Parent message"
+    )
+    message_service.create_message(
+        channel_id=channel.id,
+        user_id=user.id,
+        content="Reply",
+        thread_id=parent.id
+    )
+    message_service.add_reaction(parent.id, user.id, "👍")
+    
+    expected = [message.to_dict() for message in message_service.get_messages(channel.id)]
+    raw = message_service.get_messages_raw(channel.id)
+    assert raw == expected
+    assert raw[0]['replyCount'] == 1
+    assert raw[0]['reactions'] == {"👍": [user.id]}
+
+def test_create_message_numbers_channel_messages(message_service, user_service, channel_service):
+    """Test that created messages carry their position in the channel"""
+    user = create_test_user(user_service)
+    channel = create_test_channel(channel_service)
+    
+    first = message_service.create_message(channel_id=channel.id, user_id=user.id, content="First")
+    second = message_service.create_message(channel_id=channel.id, user_id=user.id, content="Second")
+    
+    assert first.channel_message_number == 1
+    assert second.channel_message_number == 2
+
 def test_get_message_with_thread_id(message_service, user_service, channel_service):
     """Test retrieving a message using thread_id parameter"""
     user = create_test_user(user_service)
@@ -509,4 +579,77 @@ def test_get_messages_with_time_range(message_service, user_service, channel_ser
     assert len(messages) == 3
     assert messages[0].created_at == "2023-01-01T11:00:00Z"
     assert messages[1].created_at == "2023-01-01T12:00:00Z"
-    assert messages[2].created_at == "2023-01-01T13:00:00Z" 
\ No newline at end of file
+    assert messages[2].created_at == "2023-01-01T13:00:00Z"
+
+def test_get_messages_before_cursor(message_service, user_service, channel_service):
+    user_id = "user1"
+    create_test_user(user_service, user_id=user_id)
+    channel = create_test_channel(channel_service, created_by=user_id)
+
+    timestamps = [f"2023-01-01T1{i}:00:00Z" for i in range(5)]
+    for ts in timestamps:
+        message_service.create_message(channel_id=channel.id, user_id=user_id, content="Test message", created_at=ts)
+
+    # The two messages just before the cursor, oldest first
+    messages = message_service.get_messages(channel_id=channel.id, limit=2, before=timestamps[3])
+    assert [m.created_at for m in messages] == timestamps[1:3]
+
+    # Paging again from the oldest returned message reaches the start of the channel
+    messages = message_service.get_messages(channel_id=channel.id, limit=2, before=messages[0].created_at)
+    assert [m.created_at for m in messages] == timestamps[:1]
+
+def test_get_messages_page_cursor(message_service, user_service, channel_service):
+    user_id = "user1"
+    create_test_user(user_service, user_id=user_id)
+    channel = create_test_channel(channel_service, created_by=user_id)
+
+    timestamps = [f"2023-01-01T1{i}:00:00Z" for i in range(5)]
+    for ts in timestamps:
+        message_service.create_message(channel_id=channel.id, user_id=user_id, content="Test message", created_at=ts)
+
+    # Newest page first, each page in chronological order
+    page, cursor = message_service.get_messages_page(channel.id, limit=2)
+    assert [m['createdAt'] for m in page] == timestamps[3:]
+    page, cursor = message_service.get_messages_page(channel.id, limit=2, cursor=cursor)
+    assert [m['createdAt'] for m in page] == timestamps[1:3]
+    page, cursor = message_service.get_messages_page(channel.id, limit=2, cursor=cursor)
+    assert [m['createdAt'] for m in page] == timestamps[:1]
+    assert cursor is None
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        message_service.get_messages_page(channel.id, limit=2, cursor="not-a-cursor")
+
+    # Well-formed cursors with extra or foreign keys are rejected before the query
+    foreign = _encode_cursor({'PK': 'x', 'SK': 'x', 'GSI1PK': f'CHANNEL#{channel.id}', 'GSI1SK': 'x', 'GSI2PK': 'x'})
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        message_service.get_messages_page(channel.id, limit=2, cursor=foreign)
+
+def test_write_behind_index_coalesces_words(dynamodb, user_service, channel_service):
+    service = MessageService('test_table', index_write_behind=True)
+    user_id = "user1"
+    create_test_user(user_service, user_id=user_id)
+    channel = create_test_channel(channel_service, created_by=user_id)
+
+    first = service.create_message(channel_id=channel.id, user_id=user_id, content="hello world")
+    second = service.create_message(channel_id=channel.id, user_id=user_id, content="hello again")
+    service.flush_index()
+
+    item = dynamodb.get_item(Key={'PK': 'WORD#hello', 'SK': '#METADATA'})['Item']
+    assert [entry['id'] for entry in item['messages']] == [first.id, second.id]
+
+def test_write_behind_index_retries_then_reports_failure(dynamodb, monkeypatch):
+    service = MessageService('test_table', index_write_behind=True)
+    monkeypatch.setattr('app.services.message_service.time.sleep', lambda seconds: None)
+    attempts = []
+    def flaky_append(word, entries):
+        attempts.append(word)
+        if word == 'broken' or len(attempts) == 1:
+            raise RuntimeError("throttled")
+    monkeypatch.setattr(service, '_append_word_entries', flaky_append)
+
+    recovered = service._queue_index_entry({'hello'}, {'id': 'm1'})
+    assert recovered.result(timeout=5) is None
+    failed = service._queue_index_entry({'broken'}, {'id': 'm2'})
+    with pytest.raises(RuntimeError, match="throttled"):
+        failed.result(timeout=5)
+    assert attempts.count('broken') == MessageService.INDEX_MAX_ATTEMPTS
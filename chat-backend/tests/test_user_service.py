@@ -67,6 +67,15 @@ def test_get_user_by_email(ddb):
     not_found = ddb.get_user_by_email("nonexistent@example.com")
     assert not_found is None
 
+def test_get_user_id_by_email(ddb):
+    """Test resolving an email to a user ID."""
+    user = ddb.create_user("resolve@example.com", "Resolve", "password123")
+    
+    assert ddb.get_user_id_by_email("resolve@example.com") == user.id
+    # Served from the cache the second time
+    assert ddb.get_user_id_by_email("resolve@example.com") == user.id
+    assert ddb.get_user_id_by_email("missing@example.com") is None
+
 def test_get_user_by_id(ddb):
     """Test retrieving a user by ID."""
     # Create a user first
@@ -129,6 +138,16 @@ def test_get_all_users(ddb):
     for user in all_users:
         assert set(user.keys()) == {'id', 'name', 'email'}
 
+def test_search_users(ddb):
+    """Test finding users by name prefix."""
+    ddb.create_user("alice@example.com", "Alice", "password123")
+    ddb.create_user("alicia@example.com", "Alicia", "password123")
+    ddb.create_user("bob@example.com", "Bob", "password123")
+    
+    found = ddb.search_users("Ali")
+    
+    assert {user.name for user in found} == {"Alice", "Alicia"}
+
 def test_get_persona_users(ddb):
     """Test retrieving persona users."""
     # Create regular and persona users
@@ -170,6 +189,16 @@ def test_batch_get_users(ddb):
     empty_result = ddb._batch_get_users(set())
     assert empty_result == [] 
 
+def test_batch_get_users_cached(ddb):
+    """Test that cached batch gets reuse recently read users."""
+    user = ddb.create_user("cached@example.com", "Cached User", "password123")
+    assert [u.id for u in ddb._batch_get_users({user.id}, cached=True)] == [user.id]
+    
+    # Once read, the user is served from the cache without touching the table
+    ddb.table.delete_item(Key={'PK': f'USER#{user.id}', 'SK': '#METADATA'})
+    assert [u.name for u in ddb._batch_get_users({user.id}, cached=True)] == ["Cached User"]
+    assert ddb._batch_get_users({user.id}) == []
+
 def test_get_user_by_name(ddb):
     """Test retrieving a user by username."""
     # Create a user first
@@ -46,6 +46,11 @@ def test_get_workspace_by_id(workspace_service):
     assert retrieved_workspace is not None
     assert retrieved_workspace.id == created_workspace.id
     assert retrieved_workspace.name == created_workspace.name
+    
+    # Served from the cache once read
+    workspace_service.table.delete_item(Key={'PK': f'WORKSPACE#{created_workspace.id}', 'SK': '#METADATA'})
+    assert workspace_service.get_workspace_by_id(created_workspace.id).name == name
+    assert workspace_service.get_workspace_by_id('missing') is None
 
 def test_get_all_workspaces(workspace_service):
     name1 = 'Workspace One'
@@ -81,5 +86,14 @@ def test_get_workspace_by_name(workspace_service):
 
 # Remove any channel-related tests
 
+def test_add_users_to_workspace(workspace_service):
+    workspace = workspace_service.create_workspace('Members Workspace')
+    workspace_service.add_user_to_workspace(workspace.id, 'user1')
+    workspace_service.add_users_to_workspace(workspace.id, [f'user{i}' for i in range(2, 30)])
+    
+    member_ids = workspace_service.get_workspace_member_ids(workspace.id)
+    assert member_ids == {f'user{i}' for i in range(1, 30)}
+    assert workspace_service.get_workspace_member_ids('missing') == set()
+
 if __name__ == '__main__':
     pytest.main() 
\ No newline at end of file
@@ -37,6 +37,11 @@ export const ChatMessage = ({ message, isReply = false, onReactionChange, isHigh
         );
         
         for (const filename of imageFiles) {
+          // Presigned URLs arrive with the message; only fetch ones the server could not sign
+          if (message.attachmentUrls?.[filename]) {
+            setImageUrls(prev => ({ ...prev, [filename]: message.attachmentUrls![filename] }));
+            continue;
+          }
           try {
             const response = await fetch(`${API_BASE_URL}/uploads/${filename}`);
             const data = await response.json();
@@ -51,12 +56,17 @@ export const ChatMessage = ({ message, isReply = false, onReactionChange, isHigh
     };
     
     fetchImageUrls();
-  }, [message.attachments]);
+  }, [message.attachments, message.attachmentUrls]);
 
   const getFileUrl = (filename: string) => `${API_BASE_URL}/uploads/${filename}`;
 
   const handleFileClick = useCallback(async (e: React.MouseEvent, filename: string) => {
     e.preventDefault();
+    const embeddedUrl = message.attachmentUrls?.[filename];
+    if (embeddedUrl) {
+      window.open(embeddedUrl, '_blank');
+      return;
+    }
     try {
       const response = await fetch(`${API_BASE_URL}/uploads/${filename}`);
       const data = await response.json();
@@ -66,7 +76,7 @@ export const ChatMessage = ({ message, isReply = false, onReactionChange, isHigh
     } catch (err) {
       console.error('Failed to get file URL:', err);
     }
-  }, []);
+  }, [message.attachmentUrls]);
 
   const handleEdit = async () => {
     if (!isCurrentUser) {
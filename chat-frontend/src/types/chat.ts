@@ -24,6 +24,7 @@ export interface Message {
   version: number;
   reactions?: { [emoji: string]: string[] };
   attachments: string[];
+  attachmentUrls?: { [filename: string]: string };
   replyCount?: number;
   user?: User;
   replies?: string[];